@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Benchmark model_usage.py on synthetic codexbar cost payloads.
+
+Generates exports with a configurable number of daily rows, models and
+breakdown rows per day, then records wall time and peak memory (tracemalloc)
+of the parsing and aggregation helpers for each size.
+
+Usage:
+    python bench_model_usage.py --sizes 1e3,1e4,1e5 --output bench.json
+    python bench_model_usage.py --sizes 1e7 --max-days 3650 --repeat 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Tuple
+
+import model_usage
+
+MODEL_FAMILIES = ["gpt-5", "gpt-5-codex", "o3", "o4-mini", "claude-sonnet-4", "claude-opus-4", "claude-haiku-4"]
+
+
+def model_names(count: int) -> List[str]:
+    names = []
+    for idx in range(count):
+        family = MODEL_FAMILIES[idx % len(MODEL_FAMILIES)]
+        names.append(family if idx < len(MODEL_FAMILIES) else f"{family}-{idx // len(MODEL_FAMILIES)}")
+    return names
+
+
+def write_payload(path: str, rows: int, days: int, models: int, breakdowns: int, seed: int) -> None:
+    """Write a codexbar-shaped export with `rows` daily rows spread over the last `days` days.
+
+    Rows are streamed to disk so multi-million-row payloads never exist as one string.
+    """
+    rng = random.Random(seed)
+    names = model_names(models)
+    today = date.today()
+    per_day = max(1, -(-rows // days))
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write('[{"provider": "codex", "source": "bench", "daily": [')
+        for idx in range(rows):
+            day = today - timedelta(days=days - 1 - min(idx // per_day, days - 1))
+            picked = rng.sample(names, min(breakdowns, len(names)))
+            items = [{"modelName": name, "cost": round(rng.uniform(0.0, 5.0), 4)} for name in picked]
+            tokens = rng.randint(1_000, 2_000_000)
+            row = {
+                "date": day.isoformat(),
+                "inputTokens": tokens,
+                "outputTokens": tokens // 8,
+                "cacheReadTokens": tokens * 3,
+                "cacheCreationTokens": tokens // 4,
+                "totalTokens": tokens * 4,
+                "totalCost": round(sum(item["cost"] for item in items), 4),
+                "modelsUsed": picked,
+                "modelBreakdowns": items,
+            }
+            if idx:
+                handle.write(",")
+            handle.write(json.dumps(row))
+        handle.write('], "totals": {"totalCost": 0}}, {"provider": "claude", "daily": []}]')
+
+
+def measure(fn: Callable[[], Any], repeat: int, memory: bool) -> Tuple[float, int]:
+    """Best wall time over `repeat` runs, then one traced run for peak memory."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    peak = 0
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return best, peak
+
+
+def bench_size(
+    rows: int, args: argparse.Namespace, workdir: str
+) -> List[Dict[str, Any]]:
+    path = os.path.join(workdir, f"codexbar-{rows}.json")
+    write_payload(path, rows, min(rows, args.max_days), args.models, args.breakdowns, args.seed)
+    size_bytes = os.path.getsize(path)
+
+    payload = model_usage.load_payload(path, "codex")
+    entries = model_usage.parse_daily_entries(payload)
+    model = model_usage.pick_current_model(entries)[0] or ""
+
+    def stream_summary() -> None:
+        with open(path, "r", encoding="utf-8") as handle:
+            model_usage.summarize_entries(model_usage.iter_daily_entries(handle, "codex"))
+
+    cases: List[Tuple[str, Callable[[], Any]]] = [
+        ("load_payload", lambda: model_usage.load_payload(path, "codex")),
+        ("parse_daily_entries", lambda: model_usage.parse_daily_entries(payload)),
+        ("filter_by_days", lambda: model_usage.filter_by_days(entries, args.filter_days)),
+        ("aggregate_costs", lambda: model_usage.aggregate_costs(entries)),
+        ("pick_current_model", lambda: model_usage.pick_current_model(entries)),
+        ("latest_day_cost", lambda: model_usage.latest_day_cost(entries, model)),
+        ("summarize_entries", lambda: model_usage.summarize_entries(entries)),
+        ("stream_summary", stream_summary),
+    ]
+    results = []
+    for name, fn in cases:
+        wall, peak = measure(fn, args.repeat, not args.no_memory)
+        results.append(
+            {
+                "function": name,
+                "rows": rows,
+                "payloadBytes": size_bytes,
+                "wallSeconds": wall,
+                "peakBytes": peak if not args.no_memory else None,
+            }
+        )
+        memory = f"{peak / 1e6:10.1f} MB" if not args.no_memory else ""
+        print(f"{rows:>10}  {name:<20} {wall * 1000:12.2f} ms {memory}", file=sys.stderr)
+    os.unlink(path)
+    return results
+
+
+def parse_sizes(value: str) -> List[int]:
+    try:
+        return [int(float(part)) for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid sizes '{value}' (expected e.g. 1e3,1e4,1e5)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark model_usage.py on synthetic codexbar payloads.")
+    parser.add_argument("--sizes", type=parse_sizes, default=parse_sizes("1e3,1e4,1e5"), help="Daily row counts (default: 1e3,1e4,1e5).")
+    parser.add_argument("--max-days", type=int, default=3650, help="Spread rows over at most this many days (default: 3650).")
+    parser.add_argument("--models", type=int, default=12, help="Distinct model names (default: 12).")
+    parser.add_argument("--breakdowns", type=int, default=3, help="modelBreakdowns entries per row (default: 3).")
+    parser.add_argument("--filter-days", type=int, default=30, help="--days value used for filter_by_days (default: 30).")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per function; the best is kept (default: 3).")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="model-usage-bench.json", help="JSON results path (default: model-usage-bench.json).")
+    args = parser.parse_args()
+
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="model-usage-bench-") as workdir:
+        for rows in args.sizes:
+            results.extend(bench_size(rows, args, workdir))
+
+    report = {
+        "generatedAt": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "sizes": args.sizes,
+            "maxDays": args.max_days,
+            "models": args.models,
+            "breakdowns": args.breakdowns,
+            "filterDays": args.filter_days,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"Wrote: {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
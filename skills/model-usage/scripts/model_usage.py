@@ -7,30 +7,137 @@ Defaults to current model (most recent daily entry), or list all models.
 
 from __future__ import annotations
 
-import argparse
 import json
 import os
-import subprocess
+import socket
 import sys
-from dataclasses import dataclass
+
+
+def state_dir() -> str:
+    return os.environ.get("OPENCLAW_STATE_DIR") or os.path.join(os.path.expanduser("~"), ".openclaw")
+
+
+def default_store_path() -> str:
+    return os.path.join(state_dir(), "cache", "model-usage.sqlite")
+
+
+def default_socket_path() -> str:
+    return os.path.join(state_dir(), "run", "model-usage.sock")
+
+
+def query_server(path: str, query: Dict[str, Any], timeout: float = 120.0) -> Optional[Dict[str, Any]]:
+    """Send one query to a --serve process; None when no server answers."""
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(path)
+            sock.sendall(json.dumps(query).encode("utf-8") + b"\n")
+            line = sock.makefile("rb").readline()
+    except OSError:
+        return None
+    if not line:
+        return None
+    return json.loads(line)
+
+
+# Options a --serve process can answer, and whether they take a value. Any other
+# argument (--input, --store, --stream, --help, abbreviations, ...) runs locally.
+FORWARDED_OPTIONS = {
+    "--provider": True,
+    "--mode": True,
+    "--model": True,
+    "--days": True,
+    "--since": True,
+    "--until": True,
+    "--period": True,
+    "--billing-day": True,
+    "--format": True,
+    "--pretty": False,
+    "--socket": True,
+}
+
+
+def forward_argv(argv: List[str]) -> Optional[int]:
+    """Hand the raw command line to a running --serve process; None to run locally."""
+    path = default_socket_path()
+    tokens = iter(argv)
+    for token in tokens:
+        option, has_value, value = token.partition("=")
+        if option not in FORWARDED_OPTIONS:
+            return None
+        if FORWARDED_OPTIONS[option] and not has_value:
+            value = next(tokens, "")
+        if option == "--socket":
+            path = value
+    response = query_server(path, {"argv": argv})
+    if response is None:
+        return None
+    if response.get("stdout"):
+        print(response["stdout"])
+    if response.get("stderr"):
+        print(response["stderr"], file=sys.stderr)
+    return int(response.get("code", 1))
+
+
+# Forward before importing the rest, so queries answered by a server stay cheap.
+if __name__ == "__main__":
+    forwarded = forward_argv(sys.argv[1:])
+    if forwarded is not None:
+        raise SystemExit(forwarded)
+
+import argparse
+import bisect
+import contextlib
+import gc
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NoReturn, Optional, TextIO, Tuple, Union
+
+
+PROVIDERS = ("codex", "claude")
 
 
 def eprint(msg: str) -> None:
     print(msg, file=sys.stderr)
 
 
-def run_codexbar_cost(provider: str) -> List[Dict[str, Any]]:
+@contextlib.contextmanager
+def gc_paused() -> Iterator[None]:
+    """Suspend the cyclic GC while building large acyclic structures.
+
+    Decoding an export and converting its rows allocate millions of containers,
+    and each allocation burst would otherwise trigger full collections that walk
+    everything decoded so far.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def codexbar_cost_output(provider: str) -> str:
     cmd = ["codexbar", "cost", "--format", "json", "--provider", provider]
     try:
-        output = subprocess.check_output(cmd, text=True)
+        return subprocess.check_output(cmd, text=True)
     except FileNotFoundError:
         raise RuntimeError("codexbar not found on PATH. Install CodexBar CLI first.")
     except subprocess.CalledProcessError as exc:
         raise RuntimeError(f"codexbar cost failed (exit {exc.returncode}).")
+
+
+def run_codexbar_cost(provider: str) -> List[Dict[str, Any]]:
+    output = codexbar_cost_output(provider)
     try:
-        payload = json.loads(output)
+        with gc_paused():
+            payload = json.loads(output)
     except json.JSONDecodeError as exc:
         raise RuntimeError(f"Failed to parse codexbar JSON output: {exc}")
     if not isinstance(payload, list):
@@ -45,10 +152,14 @@ def load_payload(input_path: Optional[str], provider: str) -> Dict[str, Any]:
         else:
             with open(input_path, "r", encoding="utf-8") as handle:
                 raw = handle.read()
-        data = json.loads(raw)
+        with gc_paused():
+            data = json.loads(raw)
     else:
         data = run_codexbar_cost(provider)
+    return select_provider(data, provider)
+
 
+def select_provider(data: Any, provider: str) -> Dict[str, Any]:
     if isinstance(data, dict):
         return data
 
@@ -61,117 +172,764 @@ def load_payload(input_path: Optional[str], provider: str) -> Dict[str, Any]:
     raise RuntimeError("Unsupported JSON input format.")
 
 
+NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+
+class JsonStream:
+    """Incremental reader that decodes one JSON value at a time from a text stream."""
+
+    def __init__(self, handle: TextIO, chunk_size: int = 1 << 16) -> None:
+        self._handle = handle
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._handle.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise RuntimeError(f"Failed to parse codexbar JSON: expected '{char}'.")
+        self._pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as exc:
+                if self._fill():
+                    continue
+                raise RuntimeError(f"Failed to parse codexbar JSON: {exc}")
+            # A number cut by the chunk boundary decodes as its prefix ("1." as 1, "2e" as 2),
+            # so refill while it ends the buffer or stops at a character a number could continue with.
+            if (
+                isinstance(value, (int, float))
+                and not isinstance(value, bool)
+                and (end == len(self._buf) or self._buf[end] in NUMBER_CHARS)
+                and self._fill()
+            ):
+                continue
+            self._pos = end
+            return value
+
+    def more(self, close: str) -> bool:
+        """Consume the separator after a container member; False once `close` is reached."""
+        char = self.peek()
+        self._pos += 1
+        if char == close:
+            return False
+        if char != ",":
+            raise RuntimeError(f"Failed to parse codexbar JSON: expected ',' or '{close}'.")
+        return True
+
+    def opens(self, char: str, close: str) -> bool:
+        """Consume an opening bracket; False when the container is empty."""
+        self.expect(char)
+        if self.peek() == close:
+            self._pos += 1
+            return False
+        return True
+
+    def items(self) -> Iterator[Any]:
+        """Yield the elements of the array at the current position one by one."""
+        if not self.opens("[", "]"):
+            return
+        while True:
+            yield self.value()
+            if not self.more("]"):
+                return
+
+    def keys(self) -> Iterator[str]:
+        """Yield the keys of the object at the current position; the caller consumes each value."""
+        if not self.opens("{", "}"):
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise RuntimeError("Failed to parse codexbar JSON: expected object key.")
+            self.expect(":")
+            yield key
+            if not self.more("}"):
+                return
+
+
+def iter_provider_daily(
+    stream: JsonStream, provider: Optional[str], names: Dict[str, str]
+) -> Iterator["DailyRow"]:
+    """Stream the daily rows of one provider object; returns whether the provider matched.
+
+    Rows seen before the object's `provider` key are held back until it is known.
+    """
+    matched: Optional[bool] = None if provider else True
+    pending: List[DailyRow] = []
+    for key in stream.keys():
+        if key == "daily" and stream.peek() == "[":
+            for entry in stream.items():
+                if not isinstance(entry, dict) or matched is False:
+                    continue
+                if matched:
+                    yield DailyRow.from_entry(entry, names)
+                else:
+                    pending.append(DailyRow.from_entry(entry, names))
+        elif key == "provider" and provider:
+            matched = stream.value() == provider
+            if matched:
+                yield from pending
+            pending = []
+        else:
+            stream.value()
+    return bool(matched)
+
+
+def iter_daily_entries(handle: TextIO, provider: str) -> Iterator["DailyRow"]:
+    """Incrementally parse codexbar cost JSON, yielding the daily rows for `provider`."""
+    stream = JsonStream(handle)
+    names: Dict[str, str] = {}
+    head = stream.peek()
+    if head == "{":
+        yield from iter_provider_daily(stream, None, names)
+        return
+    if head != "[":
+        raise RuntimeError("Unsupported JSON input format.")
+    if stream.opens("[", "]"):
+        while True:
+            if stream.peek() == "{":
+                if (yield from iter_provider_daily(stream, provider, names)):
+                    return
+            else:
+                stream.value()
+            if not stream.more("]"):
+                break
+    raise RuntimeError(f"Provider '{provider}' not found in codexbar payload.")
+
+
+def stream_daily_entries(input_path: Optional[str], provider: str) -> Iterator["DailyRow"]:
+    """Like `load_payload` + `parse_daily_entries`, without holding the export in memory."""
+    if input_path == "-":
+        yield from iter_daily_entries(sys.stdin, provider)
+        return
+    if input_path:
+        with open(input_path, "r", encoding="utf-8") as handle:
+            yield from iter_daily_entries(handle, provider)
+        return
+
+    cmd = ["codexbar", "cost", "--format", "json", "--provider", provider]
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True, encoding="utf-8")
+    except FileNotFoundError:
+        raise RuntimeError("codexbar not found on PATH. Install CodexBar CLI first.")
+    with proc:
+        assert proc.stdout is not None
+        yield from iter_daily_entries(proc.stdout, provider)
+        # Drain the rest so codexbar exits cleanly instead of hitting a broken pipe.
+        while proc.stdout.read(1 << 16):
+            pass
+    if proc.returncode:
+        raise RuntimeError(f"codexbar cost failed (exit {proc.returncode}).")
+
+
 @dataclass
 class ModelCost:
     model: str
     cost: float
 
 
-def parse_daily_entries(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+class DailyRow:
+    """Compact daily row holding only what the reports read.
+
+    Costs are kept as a tuple parallel to the model names. Breakdown items without
+    a string model name are dropped; a non-numeric cost becomes None. `last_used`
+    is the last `modelsUsed` entry when it is a string. The date is only parsed
+    when a window filter or the analytics first ask for `ordinal`.
+    """
+
+    __slots__ = ("date", "models", "costs", "last_used", "_ordinal")
+
+    def __init__(
+        self,
+        date: Optional[str],
+        models: Tuple[str, ...],
+        costs: Tuple[Optional[float], ...],
+        last_used: Optional[str],
+    ) -> None:
+        self.date = date
+        self.models = models
+        self.costs = costs
+        self.last_used = last_used
+
+    @property
+    def ordinal(self) -> Optional[int]:
+        """Proleptic ordinal of the date, or None when it is missing or invalid."""
+        try:
+            return self._ordinal
+        except AttributeError:
+            parsed = parse_date(self.date) if self.date is not None else None
+            self._ordinal = parsed.toordinal() if parsed else None
+            return self._ordinal
+
+    @classmethod
+    def from_entry(cls, entry: Dict[str, Any], names: Optional[Dict[str, str]] = None) -> "DailyRow":
+        """Build a row from one `daily` entry.
+
+        `names` is a per-parse memo that shares one string object per model name
+        across rows, like sys.intern but without the global table lookup.
+        """
+        if names is None:
+            names = {}
+        day = entry.get("date")
+        models: List[str] = []
+        costs: List[Optional[float]] = []
+        breakdowns = entry.get("modelBreakdowns")
+        if isinstance(breakdowns, list):
+            for item in breakdowns:
+                if isinstance(item, dict):
+                    model = item.get("modelName")
+                    if isinstance(model, str):
+                        cost = item.get("cost")
+                        models.append(names.setdefault(model, model))
+                        costs.append(float(cost) if isinstance(cost, (int, float)) else None)
+        used = entry.get("modelsUsed")
+        last_used = used[-1] if isinstance(used, list) and used and isinstance(used[-1], str) else None
+        return cls(
+            day if isinstance(day, str) else None,
+            tuple(models),
+            tuple(costs),
+            names.setdefault(last_used, last_used) if last_used is not None else None,
+        )
+
+
+def parse_daily_entries(payload: Dict[str, Any]) -> List[DailyRow]:
     daily = payload.get("daily")
     if not daily:
         return []
     if not isinstance(daily, list):
         return []
-    return [entry for entry in daily if isinstance(entry, dict)]
+    names: Dict[str, str] = {}
+    with gc_paused():
+        return [DailyRow.from_entry(entry, names) for entry in daily if isinstance(entry, dict)]
 
 
 def parse_date(value: str) -> Optional[date]:
+    # Fast path for canonical YYYY-MM-DD; strptime also accepts unpadded fields.
+    if len(value) == 10 and value[4] == "-" and value[7] == "-":
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            pass
     try:
         return datetime.strptime(value, "%Y-%m-%d").date()
     except Exception:
         return None
 
 
-def filter_by_days(entries: List[Dict[str, Any]], days: Optional[int]) -> List[Dict[str, Any]]:
+def month_day(year: int, month: int, day: int) -> date:
+    """`date(year, month, day)` with the day clamped to the end of the month."""
+    import calendar
+
+    return date(year, month, min(day, calendar.monthrange(year, month)[1]))
+
+
+def add_months(value: date, months: int, day: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return month_day(index // 12, index % 12 + 1, day)
+
+
+def period_window(period: str, anchor: date, billing_day: int = 1) -> Tuple[date, date]:
+    """Return the fixed calendar window (inclusive) of the given kind that contains `anchor`."""
+    if period == "week":
+        start = anchor - timedelta(days=anchor.weekday())
+        return start, start + timedelta(days=6)
+    if period == "month":
+        billing_day = 1
+    start = month_day(anchor.year, anchor.month, billing_day)
+    if start > anchor:
+        start = add_months(start, -1, billing_day)
+    return start, add_months(start, 1, billing_day) - timedelta(days=1)
+
+
+def resolve_window(
+    days: Optional[int] = None,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    period: Optional[str] = None,
+    billing_day: int = 1,
+    today: Optional[date] = None,
+) -> Tuple[Optional[date], Optional[date]]:
+    """Turn --days/--since/--until/--period into an inclusive (since, until) date range."""
+    anchor = until or today or date.today()
+    if period:
+        return period_window(period, anchor, billing_day)
+    if days:
+        since = anchor - timedelta(days=days - 1)
+    return since, until
+
+
+def days_cutoff(days: Optional[int]) -> Optional[date]:
+    return resolve_window(days=days)[0]
+
+
+def iter_window_entries(
+    entries: Iterable[DailyRow],
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+) -> Iterator[DailyRow]:
+    """Linear date filter for one-off queries; see DailyIndex for repeated ones.
+
+    An unbounded window passes every row through, undated ones included.
+    """
+    if since is None and until is None:
+        yield from entries
+        return
+    lo = since.toordinal() if since else float("-inf")
+    hi = until.toordinal() if until else float("inf")
+    for row in entries:
+        ordinal = row.ordinal
+        if ordinal is not None and lo <= ordinal <= hi:
+            yield row
+
+
+class DailyIndex:
+    """Daily rows sorted by date ordinal for bisected range queries."""
+
+    def __init__(self, entries: Iterable[DailyRow]) -> None:
+        self.undated: List[DailyRow] = []
+        dated: List[DailyRow] = []
+        for row in entries:
+            (self.undated if row.ordinal is None else dated).append(row)
+        # Stable sort keeps codexbar order within a date, which the summary tie-break relies on.
+        dated.sort(key=lambda row: row.ordinal)
+        self.ordinals = [row.ordinal for row in dated]
+        self.entries = dated
+
+    def __len__(self) -> int:
+        return len(self.undated) + len(self.entries)
+
+    def window(self, since: Optional[date] = None, until: Optional[date] = None) -> List[DailyRow]:
+        """Rows dated within [since, until]; undated rows only when the range is unbounded."""
+        if since is None and until is None:
+            return self.undated + self.entries
+        lo = bisect.bisect_left(self.ordinals, since.toordinal()) if since else 0
+        hi = bisect.bisect_right(self.ordinals, until.toordinal()) if until else len(self.ordinals)
+        return self.entries[lo:hi]
+
+
+def filter_by_days(entries: List[DailyRow], days: Optional[int]) -> List[DailyRow]:
     if not days:
         return entries
-    cutoff = date.today() - timedelta(days=days - 1)
-    filtered: List[Dict[str, Any]] = []
-    for entry in entries:
-        day = entry.get("date")
-        if not isinstance(day, str):
-            continue
-        parsed = parse_date(day)
-        if parsed and parsed >= cutoff:
-            filtered.append(entry)
-    return filtered
+    return DailyIndex(entries).window(days_cutoff(days))
 
 
-def aggregate_costs(entries: Iterable[Dict[str, Any]]) -> Dict[str, float]:
+def aggregate_costs(entries: Iterable[DailyRow]) -> Dict[str, float]:
     totals: Dict[str, float] = {}
-    for entry in entries:
-        breakdowns = entry.get("modelBreakdowns")
-        if not breakdowns:
-            continue
-        if not isinstance(breakdowns, list):
-            continue
-        for item in breakdowns:
-            if not isinstance(item, dict):
-                continue
-            model = item.get("modelName")
-            cost = item.get("cost")
-            if not isinstance(model, str):
-                continue
-            if not isinstance(cost, (int, float)):
-                continue
-            totals[model] = totals.get(model, 0.0) + float(cost)
+    for row in entries:
+        for model, cost in zip(row.models, row.costs):
+            if cost is not None:
+                totals[model] = totals.get(model, 0.0) + cost
     return totals
 
 
-def pick_current_model(entries: List[Dict[str, Any]]) -> Tuple[Optional[str], Optional[str]]:
+def pick_current_model(entries: List[DailyRow]) -> Tuple[Optional[str], Optional[str]]:
     if not entries:
         return None, None
     sorted_entries = sorted(
         entries,
-        key=lambda entry: entry.get("date") or "",
+        key=lambda row: row.date or "",
     )
-    for entry in reversed(sorted_entries):
-        breakdowns = entry.get("modelBreakdowns")
-        if isinstance(breakdowns, list) and breakdowns:
-            scored: List[ModelCost] = []
-            for item in breakdowns:
-                if not isinstance(item, dict):
-                    continue
-                model = item.get("modelName")
-                cost = item.get("cost")
-                if isinstance(model, str) and isinstance(cost, (int, float)):
-                    scored.append(ModelCost(model=model, cost=float(cost)))
-            if scored:
-                scored.sort(key=lambda item: item.cost, reverse=True)
-                return scored[0].model, entry.get("date") if isinstance(entry.get("date"), str) else None
-        models_used = entry.get("modelsUsed")
-        if isinstance(models_used, list) and models_used:
-            last = models_used[-1]
-            if isinstance(last, str):
-                return last, entry.get("date") if isinstance(entry.get("date"), str) else None
+    for row in reversed(sorted_entries):
+        scored = [
+            ModelCost(model=model, cost=cost) for model, cost in zip(row.models, row.costs) if cost is not None
+        ]
+        if scored:
+            scored.sort(key=lambda item: item.cost, reverse=True)
+            return scored[0].model, row.date
+        if row.last_used is not None:
+            return row.last_used, row.date
     return None, None
 
 
+@dataclass
+class UsageSummary:
+    totals: Dict[str, float] = field(default_factory=dict)
+    current_model: Optional[str] = None
+    current_date: Optional[str] = None
+    latest_costs: Dict[str, Tuple[Optional[str], Optional[float]]] = field(default_factory=dict)
+    row_count: int = 0
+    analytics: Optional["UsageAnalytics"] = None
+
+
+def summarize_stream_entries(entries: Iterable[DailyRow]) -> UsageSummary:
+    """Single forward pass of summarize_entries that holds O(models) state, for --stream.
+
+    Each model remembers the date key of its latest row, so a row only updates
+    it when the key is not older; within a row the first occurrence of a model
+    wins, as in latest_day_cost.
+    """
+    summary = UsageSummary()
+    totals = summary.totals
+    latest_costs = summary.latest_costs
+    latest_keys: Dict[str, str] = {}
+    current_key: Optional[str] = None
+    for row in entries:
+        summary.row_count += 1
+        key = row.date or ""
+        candidate: Optional[str] = None
+        best_cost: Optional[float] = None
+        seen: Tuple[str, ...] = ()
+        for model, cost in zip(row.models, row.costs):
+            if cost is not None:
+                totals[model] = totals.get(model, 0.0) + cost
+                if best_cost is None or cost > best_cost:
+                    best_cost = cost
+                    candidate = model
+            if model in seen:
+                continue
+            seen += (model,)
+            if latest_keys.get(model, "") <= key:
+                latest_keys[model] = key
+                latest_costs[model] = (row.date, cost)
+        if candidate is None:
+            candidate = row.last_used
+        if candidate is not None and (current_key is None or key >= current_key):
+            current_key = key
+            summary.current_model = candidate
+            summary.current_date = row.date
+    return summary
+
+
+def summarize_entries(entries: Iterable[DailyRow]) -> UsageSummary:
+    """Compute aggregate_costs, pick_current_model and latest_day_cost together.
+
+    Totals take one forward pass. The rows are then walked newest-first by their
+    date string, like the sorting helpers do (the sort is near-linear on
+    date-ordered exports), and the walk stops once the current model and every
+    model's latest day are known. Among rows with the same date the later one
+    wins, matching their stable sort. Iterators that are not lists go through
+    summarize_stream_entries instead, so streamed rows are never all held.
+    """
+    if not isinstance(entries, list):
+        return summarize_stream_entries(entries)
+    rows = entries
+    summary = UsageSummary(row_count=len(rows))
+    totals = summary.totals
+    unpriced: set = set()
+    for row in rows:
+        for model, cost in zip(row.models, row.costs):
+            if cost is not None:
+                totals[model] = totals.get(model, 0.0) + cost
+            else:
+                unpriced.add(model)
+    remaining = len(unpriced.union(totals))
+
+    latest_costs = summary.latest_costs
+    for row in reversed(sorted(rows, key=lambda row: row.date or "")):
+        if summary.current_model is None:
+            best_cost: Optional[float] = None
+            for model, cost in zip(row.models, row.costs):
+                if cost is not None and (best_cost is None or cost > best_cost):
+                    best_cost = cost
+                    summary.current_model = model
+            if summary.current_model is None:
+                summary.current_model = row.last_used
+            if summary.current_model is not None:
+                summary.current_date = row.date
+        if remaining:
+            for model, cost in zip(row.models, row.costs):
+                if model not in latest_costs:
+                    latest_costs[model] = (row.date, cost)
+                    remaining -= 1
+        elif summary.current_model is not None:
+            break
+    return summary
+
+
+@dataclass
+class ModelTrend:
+    model: str
+    total: float
+    rolling_7d: float
+    rolling_30d: float
+    p50: float
+    p90: float
+    p99: float
+    day_delta: float
+    burn_rate: float
+    projected_30d: float
+
+
+@dataclass
+class UsageAnalytics:
+    start: str
+    end: str
+    days: int
+    total: ModelTrend
+    models: List[ModelTrend]
+
+
+ANALYTICS_TOTAL = "(all models)"
+FIT_DAYS = 30
+PROJECTION_DAYS = 30
+
+
+def analyze_entries(entries: Iterable[DailyRow], end: Optional[date] = None) -> Optional[UsageAnalytics]:
+    """Time-series view of daily costs over a dense date x model matrix (requires NumPy).
+
+    The matrix runs up to `end` (the window end, e.g. today or --until; days
+    without rows count as zero), and rolling sums and the day-over-day delta are
+    taken as of that day. Each model's burn rate is the end-day value of a
+    least-squares line fitted to the last 30 days, and its projection sums that
+    line, clipped at zero, over the next 30 days. The combined column reports the
+    sum of the per-model burn rates and projections.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        raise RuntimeError("--mode analytics requires NumPy (pip install numpy).")
+
+    ordinals: List[int] = []
+    model_ids: List[int] = []
+    costs: List[float] = []
+    models: Dict[str, int] = {}
+    for row in entries:
+        if row.ordinal is None:
+            continue
+        for model, cost in zip(row.models, row.costs):
+            if cost is None:
+                continue
+            ordinals.append(row.ordinal)
+            model_ids.append(models.setdefault(model, len(models)))
+            costs.append(cost)
+    if not costs:
+        return None
+
+    days = np.asarray(ordinals, dtype=np.int64)
+    first = int(days.min())
+    last = max(int(days.max()), end.toordinal() if end else 0)
+    n_days = last - first + 1
+    matrix = np.zeros((n_days, len(models) + 1))
+    np.add.at(matrix, (days - first, np.asarray(model_ids)), np.asarray(costs))
+    matrix[:, -1] = matrix[:, :-1].sum(axis=1)
+
+    cumulative = np.vstack([np.zeros((1, matrix.shape[1])), matrix.cumsum(axis=0)])
+    rolling_7d = cumulative[-1] - cumulative[max(n_days - 7, 0)]
+    rolling_30d = cumulative[-1] - cumulative[max(n_days - 30, 0)]
+    p50, p90, p99 = np.percentile(matrix, [50, 90, 99], axis=0)
+    day_delta = matrix[-1] - matrix[-2] if n_days > 1 else np.zeros(matrix.shape[1])
+
+    recent = matrix[-FIT_DAYS:]
+    x = np.arange(len(recent), dtype=float)
+    if len(recent) > 1:
+        slope, intercept = np.polyfit(x, recent, 1)
+    else:
+        slope, intercept = np.zeros(matrix.shape[1]), recent[0]
+    burn_rate = np.clip(intercept + slope * (len(recent) - 1), 0.0, None)
+    future = len(recent) + np.arange(PROJECTION_DAYS, dtype=float)
+    projected = np.clip(intercept + np.outer(future, slope), 0.0, None).sum(axis=0)
+    burn_rate[-1] = burn_rate[:-1].sum()
+    projected[-1] = projected[:-1].sum()
+
+    columns = zip(
+        [*models, ANALYTICS_TOTAL],
+        *(values.tolist() for values in (
+            cumulative[-1], rolling_7d, rolling_30d, p50, p90, p99, day_delta, burn_rate, projected
+        )),
+    )
+    trends = [ModelTrend(*column) for column in columns]
+    trends, total = trends[:-1], trends[-1]
+    trends.sort(key=lambda trend: trend.total, reverse=True)
+    return UsageAnalytics(
+        start=date.fromordinal(first).isoformat(),
+        end=date.fromordinal(last).isoformat(),
+        days=n_days,
+        total=total,
+        models=trends,
+    )
+
+
+# Date key for rows without a valid date; only unbounded windows include them.
+UNDATED = ""
+
+STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS days (
+    provider TEXT NOT NULL,
+    date TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    models_used TEXT NOT NULL,
+    PRIMARY KEY (provider, date)
+);
+CREATE TABLE IF NOT EXISTS costs (
+    provider TEXT NOT NULL,
+    date TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    model TEXT NOT NULL,
+    cost REAL,
+    PRIMARY KEY (provider, date, model)
+);
+CREATE TABLE IF NOT EXISTS syncs (
+    provider TEXT PRIMARY KEY,
+    synced_at REAL NOT NULL
+);
+"""
+
+
+class UsageStore:
+    """On-disk SQLite copy of normalized daily rows, one row per provider and date.
+
+    Rows without a valid date are kept together under the UNDATED key. Rows
+    sharing a date, and repeated model names within a day, are merged into a
+    single cost per model.
+    """
+
+    def __init__(self, path: str) -> None:
+        import sqlite3
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Several providers may merge concurrently; wait for the write lock instead of failing.
+        self._db = sqlite3.connect(path, timeout=30)
+        self._db.executescript(STORE_SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def is_fresh(self, provider: str, max_age: float) -> bool:
+        row = self._db.execute("SELECT synced_at FROM syncs WHERE provider = ?", (provider,)).fetchone()
+        return row is not None and time.time() - row[0] < max_age
+
+    def merge(self, provider: str, entries: Iterable[DailyRow]) -> int:
+        """Upsert dates whose content changed since the last merge; returns the number of dates written.
+
+        All rows of a date are folded together first, so an export with several
+        rows per day stores their summed costs and the last `modelsUsed` seen.
+        """
+        import hashlib
+
+        days: Dict[str, Tuple[Dict[str, Optional[float]], Optional[str]]] = {}
+        for row in entries:
+            day = date.fromordinal(row.ordinal).isoformat() if row.ordinal is not None else UNDATED
+            costs, last_used = days.get(day, ({}, None))
+            for model, cost in zip(row.models, row.costs):
+                previous = costs.get(model)
+                if cost is not None:
+                    costs[model] = cost + (previous or 0.0)
+                else:
+                    costs.setdefault(model, None)
+            days[day] = (costs, row.last_used or last_used)
+
+        digests = dict(self._db.execute("SELECT date, digest FROM days WHERE provider = ?", (provider,)))
+        changed = 0
+        with self._db:
+            for day, (costs, last_used) in days.items():
+                models_used = [last_used] if last_used is not None else []
+                encoded = json.dumps([models_used, list(costs.items())])
+                digest = hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+                if digests.get(day) == digest:
+                    continue
+                self._db.execute("DELETE FROM costs WHERE provider = ? AND date = ?", (provider, day))
+                self._db.executemany(
+                    "INSERT INTO costs (provider, date, position, model, cost) VALUES (?, ?, ?, ?, ?)",
+                    [(provider, day, pos, model, cost) for pos, (model, cost) in enumerate(costs.items())],
+                )
+                self._db.execute(
+                    "INSERT OR REPLACE INTO days (provider, date, digest, models_used) VALUES (?, ?, ?, ?)",
+                    (provider, day, digest, json.dumps(models_used)),
+                )
+                changed += 1
+            self._db.execute(
+                "INSERT OR REPLACE INTO syncs (provider, synced_at) VALUES (?, ?)",
+                (provider, time.time()),
+            )
+        return changed
+
+    @staticmethod
+    def _bounds(since: Optional[date], until: Optional[date]) -> Tuple[str, str]:
+        # UNDATED sorts before every ISO date, so only an unbounded window reaches it.
+        lo = since.isoformat() if since else UNDATED if until is None else "0001-01-01"
+        return lo, until.isoformat() if until else "9999-12-31"
+
+    def entries(
+        self, provider: str, since: Optional[date] = None, until: Optional[date] = None
+    ) -> Iterator[DailyRow]:
+        """Yield stored rows in date order, the undated row first."""
+        lo, hi = self._bounds(since, until)
+        costs = self._db.execute(
+            "SELECT date, model, cost FROM costs"
+            " WHERE provider = ? AND date BETWEEN ? AND ? ORDER BY date, position",
+            (provider, lo, hi),
+        )
+        pending = next(costs, None)
+        for day, models_used in self._db.execute(
+            "SELECT date, models_used FROM days WHERE provider = ? AND date BETWEEN ? AND ? ORDER BY date",
+            (provider, lo, hi),
+        ):
+            models: List[str] = []
+            day_costs: List[Optional[float]] = []
+            while pending is not None and pending[0] == day:
+                models.append(sys.intern(pending[1]))
+                day_costs.append(pending[2])
+                pending = next(costs, None)
+            used = json.loads(models_used)
+            yield DailyRow(
+                day if day != UNDATED else None,
+                tuple(models),
+                tuple(day_costs),
+                sys.intern(used[-1]) if used else None,
+            )
+
+    def totals(
+        self, provider: str, since: Optional[date] = None, until: Optional[date] = None
+    ) -> Dict[str, float]:
+        lo, hi = self._bounds(since, until)
+        return dict(
+            self._db.execute(
+                "SELECT model, SUM(cost) FROM costs"
+                " WHERE provider = ? AND date BETWEEN ? AND ? AND cost IS NOT NULL GROUP BY model",
+                (provider, lo, hi),
+            )
+        )
+
+
 def usd(value: Optional[float]) -> str:
     if value is None:
         return "—"
     return f"${value:,.2f}"
 
 
-def latest_day_cost(entries: List[Dict[str, Any]], model: str) -> Tuple[Optional[str], Optional[float]]:
+def signed_usd(value: float) -> str:
+    return f"{'-' if value < 0 else '+'}{usd(abs(value))}"
+
+
+def latest_day_cost(entries: List[DailyRow], model: str) -> Tuple[Optional[str], Optional[float]]:
     if not entries:
         return None, None
     sorted_entries = sorted(
         entries,
-        key=lambda entry: entry.get("date") or "",
+        key=lambda row: row.date or "",
     )
-    for entry in reversed(sorted_entries):
-        breakdowns = entry.get("modelBreakdowns")
-        if not isinstance(breakdowns, list):
-            continue
-        for item in breakdowns:
-            if not isinstance(item, dict):
-                continue
-            if item.get("modelName") == model:
-                cost = item.get("cost") if isinstance(item.get("cost"), (int, float)) else None
-                day = entry.get("date") if isinstance(entry.get("date"), str) else None
-                return day, float(cost) if cost is not None else None
+    for row in reversed(sorted_entries):
+        for name, cost in zip(row.models, row.costs):
+            if name == model:
+                return row.date, cost
     return None, None
 
 
@@ -201,6 +959,23 @@ def render_text_all(provider: str, totals: Dict[str, float]) -> str:
     return "\n".join(lines)
 
 
+def render_text_analytics(provider: str, analytics: UsageAnalytics) -> str:
+    lines = [
+        f"Provider: {provider}",
+        f"Window: {analytics.start} .. {analytics.end} ({analytics.days} days)",
+        "Models:",
+    ]
+    for trend in [*analytics.models, analytics.total]:
+        lines.append(
+            f"- {trend.model}: {usd(trend.total)}"
+            f" | 7d {usd(trend.rolling_7d)} | 30d {usd(trend.rolling_30d)}"
+            f" | daily p50/p90/p99 {usd(trend.p50)}/{usd(trend.p90)}/{usd(trend.p99)}"
+            f" | day delta {signed_usd(trend.day_delta)}"
+            f" | burn {usd(trend.burn_rate)}/day, next {PROJECTION_DAYS}d {usd(trend.projected_30d)}"
+        )
+    return "\n".join(lines)
+
+
 def build_json_current(
     provider: str,
     model: str,
@@ -233,78 +1008,582 @@ def build_json_all(provider: str, totals: Dict[str, float]) -> Dict[str, Any]:
     }
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser(description="Summarize CodexBar model usage from local cost logs.")
-    parser.add_argument("--provider", choices=["codex", "claude"], default="codex")
-    parser.add_argument("--mode", choices=["current", "all"], default="current")
-    parser.add_argument("--model", help="Explicit model name to report instead of auto-current.")
-    parser.add_argument("--input", help="Path to codexbar cost JSON (or '-' for stdin).")
-    parser.add_argument("--days", type=int, help="Limit to last N days (based on daily rows).")
-    parser.add_argument("--format", choices=["text", "json"], default="text")
-    parser.add_argument("--pretty", action="store_true", help="Pretty-print JSON output.")
+def trend_json(trend: ModelTrend) -> Dict[str, Any]:
+    return {
+        "model": trend.model,
+        "totalCostUSD": trend.total,
+        "rolling7dCostUSD": trend.rolling_7d,
+        "rolling30dCostUSD": trend.rolling_30d,
+        "dailyPercentilesUSD": {"p50": trend.p50, "p90": trend.p90, "p99": trend.p99},
+        "dayOverDayDeltaUSD": trend.day_delta,
+        "burnRateUSDPerDay": trend.burn_rate,
+        "projectedNext30dCostUSD": trend.projected_30d,
+    }
 
-    args = parser.parse_args()
 
-    try:
-        payload = load_payload(args.input, args.provider)
-    except Exception as exc:
-        eprint(str(exc))
-        return 1
+def build_json_analytics(provider: str, analytics: UsageAnalytics) -> Dict[str, Any]:
+    return {
+        "provider": provider,
+        "mode": "analytics",
+        "startDate": analytics.start,
+        "endDate": analytics.end,
+        "days": analytics.days,
+        "total": trend_json(analytics.total),
+        "models": [trend_json(trend) for trend in analytics.models],
+    }
+
+
+def expand_inputs(patterns: List[str]) -> List[str]:
+    """Expand ~ and globs in --input values, keeping order and dropping duplicates."""
+    import glob
+
+    paths: List[str] = []
+    for pattern in patterns:
+        if pattern == "-":
+            matches = ["-"]
+        else:
+            pattern = os.path.expanduser(pattern)
+            matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+            if not matches:
+                raise RuntimeError(f"No codexbar exports match '{pattern}'.")
+        for path in matches:
+            if path not in paths:
+                paths.append(path)
+    if "-" in paths and len(paths) > 1:
+        raise RuntimeError("stdin ('-') cannot be combined with other --input paths.")
+    return paths
+
+
+ExportDays = Dict[Optional[str], Dict[str, Tuple[Dict[str, float], Optional[str]]]]
+MergedDays = Dict[str, Dict[str, Tuple[Dict[str, float], Optional[str]]]]
+
+
+def parse_export(path: str) -> ExportDays:
+    """Reduce one export to {provider: {date: (model costs, last modelsUsed)}} (runs in a worker process).
+
+    A bare provider object without a `provider` key is filed under None, and
+    undated rows under UNDATED.
+    """
+    with open(path, "r", encoding="utf-8") as handle:
+        try:
+            with gc_paused():
+                data = json.load(handle)
+        except json.JSONDecodeError as exc:
+            raise RuntimeError(f"Failed to parse codexbar JSON in {path}: {exc}")
+    objects = data if isinstance(data, list) else [data]
+    result: ExportDays = {}
+    for obj in objects:
+        if not isinstance(obj, dict):
+            continue
+        provider = obj.get("provider") if isinstance(obj.get("provider"), str) else None
+        days = result.setdefault(provider, {})
+        for row in parse_daily_entries(obj):
+            day = date.fromordinal(row.ordinal).isoformat() if row.ordinal is not None else UNDATED
+            costs, last_used = days.get(day, ({}, None))
+            for model, cost in zip(row.models, row.costs):
+                if cost is not None:
+                    costs[model] = costs.get(model, 0.0) + cost
+            days[day] = (costs, row.last_used or last_used)
+    return result
 
-    entries = parse_daily_entries(payload)
-    entries = filter_by_days(entries, args.days)
 
-    if args.mode == "current":
-        model = args.model
+def merge_exports(paths: List[str], providers: List[str], jobs: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Parse exports in a process pool and merge them into one codexbar-shaped payload.
+
+    Exports in the same directory are treated as repeated snapshots of one
+    source (e.g. one machine): within a source the largest cost per
+    (provider, date, model) wins, since a later snapshot of a day only ever
+    adds usage. Costs of different sources are then summed.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    sources: Dict[str, MergedDays] = {}
+    workers = max(1, min(jobs or os.cpu_count() or 1, len(paths)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        exports = pool.map(parse_export, paths, chunksize=max(1, len(paths) // (workers * 4)))
+        for path, export in zip(paths, exports):
+            snapshots = sources.setdefault(os.path.dirname(os.path.abspath(path)), {})
+            for provider, days in export.items():
+                for target in [provider] if provider else providers:
+                    target_days = snapshots.setdefault(target, {})
+                    for day, (costs, last_used) in days.items():
+                        merged_costs, merged_last = target_days.get(day, ({}, None))
+                        for model, cost in costs.items():
+                            if cost > merged_costs.get(model, float("-inf")):
+                                merged_costs[model] = cost
+                        target_days[day] = (merged_costs, last_used or merged_last)
+    merged: MergedDays = {}
+    for snapshots in sources.values():
+        for provider, days in snapshots.items():
+            target_days = merged.setdefault(provider, {})
+            for day, (costs, last_used) in days.items():
+                summed, merged_last = target_days.get(day, ({}, None))
+                for model, cost in costs.items():
+                    summed[model] = summed.get(model, 0.0) + cost
+                target_days[day] = (summed, last_used or merged_last)
+    return [
+        {
+            "provider": provider,
+            "daily": [
+                {
+                    "date": day,
+                    "modelsUsed": [last_used] if last_used else [],
+                    "modelBreakdowns": [{"modelName": model, "cost": cost} for model, cost in costs.items()],
+                }
+                for day, (costs, last_used) in sorted(days.items())
+            ],
+        }
+        for provider, days in merged.items()
+    ]
+
+
+def cli_date(value: str) -> date:
+    parsed = parse_date(value)
+    if parsed is None:
+        raise argparse.ArgumentTypeError(f"invalid date '{value}' (expected YYYY-MM-DD)")
+    return parsed
+
+
+def read_daily_entries(
+    args: argparse.Namespace, provider: str, data: Optional[Any] = None
+) -> Iterable[DailyRow]:
+    if data is not None:
+        return parse_daily_entries(select_provider(data, provider))
+    if args.stream:
+        return stream_daily_entries(args.input, provider)
+    return parse_daily_entries(load_payload(args.input, provider))
+
+
+def summarize_provider(
+    args: argparse.Namespace,
+    provider: str,
+    since: Optional[date],
+    until: Optional[date],
+    data: Optional[Any] = None,
+) -> UsageSummary:
+    if args.store:
+        with contextlib.closing(UsageStore(args.store)) as store:
+            if args.inputs or not store.is_fresh(provider, args.store_max_age):
+                store.merge(provider, read_daily_entries(args, provider, data))
+            if args.mode == "all":
+                return UsageSummary(totals=store.totals(provider, since, until))
+            rows: Iterable[DailyRow] = store.entries(provider, since, until)
+            return summarize_rows(args.mode, rows, until)
+    # One query scans the rows once; sorting them into a DailyIndex only pays off for --serve.
+    rows = iter_window_entries(read_daily_entries(args, provider, data), since, until)
+    if not args.stream or data is not None:
+        rows = list(rows)
+    return summarize_rows(args.mode, rows, until)
+
+
+def summarize_rows(mode: str, rows: Iterable[DailyRow], until: Optional[date] = None) -> UsageSummary:
+    if mode == "analytics":
+        # Calendar periods resolve to a window end that can lie in the future; stop at today.
+        today = date.today()
+        return UsageSummary(analytics=analyze_entries(rows, min(until, today) if until else today))
+    if mode == "all":
+        return UsageSummary(totals=aggregate_costs(rows))
+    return summarize_entries(rows)
+
+
+def report_fields(
+    mode: str, provider: str, summary: UsageSummary, model: Optional[str]
+) -> Optional[Dict[str, Any]]:
+    """Keyword arguments for the renderers/JSON builders of `mode`, or None when there is no data."""
+    if mode == "current":
         latest_date = None
         if not model:
-            model, latest_date = pick_current_model(entries)
+            model, latest_date = summary.current_model, summary.current_date
         if not model:
-            eprint("No model data found in codexbar cost payload.")
-            return 2
-        totals = aggregate_costs(entries)
-        total_cost = totals.get(model)
-        latest_cost_date, latest_cost = latest_day_cost(entries, model)
-
-        if args.format == "json":
-            payload_out = build_json_current(
-                provider=args.provider,
-                model=model,
-                latest_date=latest_date,
-                total_cost=total_cost,
-                latest_cost=latest_cost,
-                latest_cost_date=latest_cost_date,
-                entry_count=len(entries),
-            )
-            indent = 2 if args.pretty else None
-            print(json.dumps(payload_out, indent=indent, sort_keys=args.pretty))
-        else:
-            print(
-                render_text_current(
-                    provider=args.provider,
-                    model=model,
-                    latest_date=latest_date,
-                    total_cost=total_cost,
-                    latest_cost=latest_cost,
-                    latest_cost_date=latest_cost_date,
-                    entry_count=len(entries),
-                )
-            )
-        return 0
+            return None
+        latest_cost_date, latest_cost = summary.latest_costs.get(model, (None, None))
+        return {
+            "provider": provider,
+            "model": model,
+            "latest_date": latest_date,
+            "total_cost": summary.totals.get(model),
+            "latest_cost": latest_cost,
+            "latest_cost_date": latest_cost_date,
+            "entry_count": summary.row_count,
+        }
+    if mode == "analytics":
+        if summary.analytics is None:
+            return None
+        return {"provider": provider, "analytics": summary.analytics}
+    if not summary.totals:
+        return None
+    return {"provider": provider, "totals": summary.totals}
+
+
+NO_DATA_MESSAGES = {
+    "current": "No model data found in codexbar cost payload.",
+    "all": "No model breakdowns found in codexbar cost payload.",
+    "analytics": "No dated model breakdowns found in codexbar cost payload.",
+}
+RENDERERS = {
+    "current": (render_text_current, build_json_current),
+    "all": (render_text_all, build_json_all),
+    "analytics": (render_text_analytics, build_json_analytics),
+}
+
+
+def collect_summaries(
+    summarize: Callable[[str], UsageSummary], providers: List[str]
+) -> List[Union[UsageSummary, Exception]]:
+    """Summarize each provider on its own thread so codexbar calls overlap."""
+    if not providers:
+        return []
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=len(providers)) as pool:
+        futures = [pool.submit(summarize, provider) for provider in providers]
+    results: List[Union[UsageSummary, Exception]] = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as exc:
+            results.append(exc)
+    return results
+
+
+def build_report(
+    args: argparse.Namespace, providers: List[str], summaries: List[Union[UsageSummary, Exception]]
+) -> Tuple[int, str, str]:
+    """Render per-provider summaries into (exit code, stdout text, stderr text).
 
-    totals = aggregate_costs(entries)
-    if not totals:
-        eprint("No model breakdowns found in codexbar cost payload.")
-        return 2
+    Providers that failed (exit 1) or had no data (exit 2) are reported on stderr
+    while the others still render.
+    """
+    prefix = len(providers) > 1
+    results: List[Dict[str, Any]] = []
+    errors: List[str] = []
+    exit_code = 0
+    for provider, summary in zip(providers, summaries):
+        label = f"{provider}: " if prefix else ""
+        if isinstance(summary, Exception):
+            errors.append(f"{label}{summary}")
+            exit_code = 1
+            continue
+        fields = report_fields(args.mode, provider, summary, args.model)
+        if fields is None:
+            errors.append(f"{label}{NO_DATA_MESSAGES[args.mode]}")
+            exit_code = exit_code or 2
+            continue
+        results.append(fields)
 
-    if args.format == "json":
-        payload_out = build_json_all(provider=args.provider, totals=totals)
+    output = ""
+    if results and args.format == "json":
+        build = RENDERERS[args.mode][1]
+        payloads = [build(**fields) for fields in results]
         indent = 2 if args.pretty else None
-        print(json.dumps(payload_out, indent=indent, sort_keys=args.pretty))
-    else:
-        print(render_text_all(provider=args.provider, totals=totals))
+        output = json.dumps(payloads if prefix else payloads[0], indent=indent, sort_keys=args.pretty)
+    elif results:
+        render = RENDERERS[args.mode][0]
+        output = "\n\n".join(render(**fields) for fields in results)
+    return exit_code, output, "\n".join(errors)
+
+
+class UsageServer:
+    """Parsed daily rows per provider kept in memory for --serve.
+
+    A background thread re-fetches every known provider on an interval; the
+    index (and any cached summaries) is only rebuilt when the raw export changed.
+    """
+
+    def __init__(self, input_path: Optional[str], interval: float) -> None:
+        self._input = input_path
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._indexes: Dict[str, DailyIndex] = {}
+        self._digests: Dict[str, str] = {}
+        self._summaries: Dict[Tuple[Any, ...], UsageSummary] = {}
+
+    def _fetch(self, provider: str) -> str:
+        if self._input:
+            with open(self._input, "r", encoding="utf-8") as handle:
+                return handle.read()
+        return codexbar_cost_output(provider)
+
+    def refresh(self, provider: str) -> bool:
+        import hashlib
+
+        raw = self._fetch(provider)
+        digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+        if self._digests.get(provider) == digest:
+            return False
+        try:
+            with gc_paused():
+                data = json.loads(raw)
+        except json.JSONDecodeError as exc:
+            raise RuntimeError(f"Failed to parse codexbar JSON output: {exc}")
+        index = DailyIndex(parse_daily_entries(select_provider(data, provider)))
+        with self._lock:
+            self._indexes[provider] = index
+            self._digests[provider] = digest
+            self._summaries = {key: value for key, value in self._summaries.items() if key[0] != provider}
+        return True
+
+    def refresh_forever(self) -> None:
+        while True:
+            time.sleep(self._interval)
+            for provider in list(self._indexes):
+                try:
+                    self.refresh(provider)
+                except Exception as exc:
+                    eprint(f"model-usage: refreshing {provider} failed: {exc}")
+
+    def summarize(self, provider: str, mode: str, since: Optional[date], until: Optional[date]) -> UsageSummary:
+        # Analytics are anchored on today unless --until is earlier, so cached summaries expire at midnight.
+        key = (provider, mode, since, until, date.today())
+        with self._lock:
+            cached = self._summaries.get(key)
+            index = self._indexes.get(provider)
+        if cached is not None:
+            return cached
+        if index is None:
+            self.refresh(provider)
+            with self._lock:
+                index = self._indexes[provider]
+        summary = summarize_rows(mode, index.window(since, until), until)
+        with self._lock:
+            if self._indexes.get(provider) is index:
+                self._summaries[key] = summary
+        return summary
+
+    def handle(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        if query.get("ping"):
+            return {"code": 0, "stdout": "", "stderr": ""}
+        if "argv" in query:
+            try:
+                query = query_from_argv(query["argv"])
+            except ValueError as exc:
+                return {"code": 2, "stdout": "", "stderr": str(exc)}
+        args = argparse.Namespace(
+            mode=query["mode"], model=query.get("model"), format=query["format"], pretty=query.get("pretty")
+        )
+        since = cli_date(query["since"]) if query.get("since") else None
+        until = cli_date(query["until"]) if query.get("until") else None
+        providers = query["providers"]
+        summaries = collect_summaries(lambda provider: self.summarize(provider, args.mode, since, until), providers)
+        code, output, errors = build_report(args, providers, summaries)
+        return {"code": code, "stdout": output, "stderr": errors}
+
+
+def build_query(
+    args: argparse.Namespace, providers: List[str], since: Optional[date], until: Optional[date]
+) -> Dict[str, Any]:
+    return {
+        "providers": providers,
+        "mode": args.mode,
+        "model": args.model,
+        "since": since.isoformat() if since else None,
+        "until": until.isoformat() if until else None,
+        "format": args.format,
+        "pretty": args.pretty,
+    }
+
+
+def serve(args: argparse.Namespace, providers: List[str]) -> int:
+    import signal
+    import socketserver
+
+    if args.input == "-" or len(args.inputs) > 1:
+        eprint("--serve needs codexbar or a single --input file path.")
+        return 1
+    if not hasattr(socket, "AF_UNIX"):
+        eprint("--serve requires Unix domain sockets.")
+        return 1
+    server = UsageServer(args.input, args.refresh_interval)
+    for provider in providers if args.provider else []:
+        try:
+            server.refresh(provider)
+        except Exception as exc:
+            eprint(f"model-usage: loading {provider} failed: {exc}")
+
+    path = args.socket
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if os.path.exists(path):
+        if query_server(path, {"ping": True}, timeout=2.0) is not None:
+            eprint(f"model-usage server already running on {path}")
+            return 1
+        os.unlink(path)
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            try:
+                response = server.handle(json.loads(self.rfile.readline()))
+            except Exception as exc:
+                response = {"code": 1, "stdout": "", "stderr": str(exc)}
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+    def stop(signum: int, frame: Any) -> None:
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    with socketserver.ThreadingUnixStreamServer(path, Handler) as unix_server:
+        os.chmod(path, 0o600)
+        threading.Thread(target=server.refresh_forever, daemon=True).start()
+        eprint(f"model-usage: serving on {path}")
+        try:
+            unix_server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(path)
     return 0
 
 
+def build_parser(parser_class: type = argparse.ArgumentParser) -> argparse.ArgumentParser:
+    parser = parser_class(description="Summarize CodexBar model usage from local cost logs.")
+    parser.add_argument(
+        "--provider",
+        action="append",
+        choices=[*PROVIDERS, "all"],
+        help="Provider to report (default: codex). Repeat or pass 'all' to fetch several concurrently.",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["current", "all", "analytics"],
+        default="current",
+        help="current model, all-model totals, or per-model trends (analytics, requires NumPy).",
+    )
+    parser.add_argument("--model", help="Explicit model name to report instead of auto-current.")
+    parser.add_argument(
+        "--input",
+        nargs="+",
+        dest="inputs",
+        default=[],
+        metavar="PATH",
+        help="Path(s) or globs of codexbar cost JSON (or '-' for stdin). Several exports are merged.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        metavar="N",
+        help="Worker processes for parsing several --input exports (default: CPU count).",
+    )
+    window = parser.add_mutually_exclusive_group()
+    window.add_argument("--days", type=int, help="Limit to last N days (based on daily rows).")
+    window.add_argument("--since", type=cli_date, metavar="YYYY-MM-DD", help="Only include rows on or after this date.")
+    window.add_argument(
+        "--period",
+        choices=["week", "month", "billing"],
+        help="Fixed calendar window containing today (or --until): ISO week, calendar month, or billing period.",
+    )
+    parser.add_argument("--until", type=cli_date, metavar="YYYY-MM-DD", help="Only include rows on or before this date.")
+    parser.add_argument(
+        "--billing-day",
+        type=int,
+        choices=range(1, 32),
+        default=1,
+        metavar="DAY",
+        help="Day of month a billing period starts on (for --period billing; default: 1).",
+    )
+    parser.add_argument("--format", choices=["text", "json"], default="text")
+    parser.add_argument("--pretty", action="store_true", help="Pretty-print JSON output.")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Parse the codexbar JSON incrementally instead of loading it whole (for large exports).",
+    )
+    parser.add_argument(
+        "--store",
+        nargs="?",
+        const=default_store_path(),
+        metavar="PATH",
+        help="Keep daily rows in a local SQLite store and answer from it (default: ~/.openclaw/cache/model-usage.sqlite).",
+    )
+    parser.add_argument(
+        "--store-max-age",
+        type=float,
+        default=300.0,
+        metavar="SECONDS",
+        help="With --store, skip running codexbar if the provider was synced this recently (default: 300).",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run a long-lived server that keeps parsed usage in memory and answers queries on --socket.",
+    )
+    parser.add_argument(
+        "--socket",
+        default=default_socket_path(),
+        metavar="PATH",
+        help="Unix socket of the --serve process; used automatically when present (default: ~/.openclaw/run/model-usage.sock).",
+    )
+    parser.add_argument(
+        "--refresh-interval",
+        type=float,
+        default=60.0,
+        metavar="SECONDS",
+        help="With --serve, how often to re-check codexbar for new data (default: 60).",
+    )
+
+    return parser
+
+
+class QueryParser(argparse.ArgumentParser):
+    """Parser for forwarded command lines: usage errors raise instead of exiting the server."""
+
+    def error(self, message: str) -> NoReturn:
+        raise ValueError(f"{self.format_usage()}{self.prog}: error: {message}")
+
+
+def resolve_providers(names: Optional[List[str]]) -> List[str]:
+    providers: List[str] = []
+    for name in names or ["codex"]:
+        for provider in PROVIDERS if name == "all" else [name]:
+            if provider not in providers:
+                providers.append(provider)
+    return providers
+
+
+def query_from_argv(argv: List[str]) -> Dict[str, Any]:
+    """Resolve a command line handed over by forward_argv into a server query."""
+    args = build_parser(QueryParser).parse_args(argv)
+    since, until = resolve_window(args.days, args.since, args.until, args.period, args.billing_day)
+    return build_query(args, resolve_providers(args.provider), since, until)
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    since, until = resolve_window(args.days, args.since, args.until, args.period, args.billing_day)
+    providers = resolve_providers(args.provider)
+
+    try:
+        args.inputs = expand_inputs(args.inputs)
+    except RuntimeError as exc:
+        eprint(str(exc))
+        return 1
+    args.input = args.inputs[0] if len(args.inputs) == 1 else None
+
+    if args.serve:
+        return serve(args, providers)
+
+    # stdin can only be read once, so several providers share one decoded payload.
+    data = None
+    if len(args.inputs) > 1:
+        try:
+            data = merge_exports(args.inputs, providers, args.jobs)
+        except Exception as exc:
+            eprint(str(exc))
+            return 1
+    elif args.input == "-" and len(providers) > 1:
+        try:
+            with gc_paused():
+                data = json.load(sys.stdin)
+        except json.JSONDecodeError as exc:
+            eprint(f"Failed to parse codexbar JSON: {exc}")
+            return 1
+
+    summaries = collect_summaries(lambda provider: summarize_provider(args, provider, since, until, data), providers)
+    exit_code, output, errors = build_report(args, providers, summaries)
+    if errors:
+        eprint(errors)
+    if output:
+        print(output)
+    return exit_code
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -14,12 +14,41 @@ Usage:
 
 Multi-image editing (up to 14 images):
     uv run generate_image.py --prompt "combine these images" --filename "output.png" -i img1.png -i img2.png -i img3.png
+
+Batch mode (one JSON object per line: prompt, filename, optional input_images and resolution):
+    uv run generate_image.py --jobs jobs.jsonl [--concurrency 4]
+
+Warm worker (keeps imports and clients loaded; later invocations forward to it
+over a Unix socket and run in-process when no worker is listening):
+    uv run generate_image.py --serve
 """
 
 import argparse
+import contextlib
+import hashlib
+import json
+import multiprocessing
 import os
+import signal
+import socket
+import socketserver
 import sys
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Callable
+
+RESOLUTIONS = ["1K", "2K", "4K"]
+MAX_INPUT_IMAGES = 14
+# Inputs are downscaled so their longest edge fits the output resolution.
+RESOLUTION_EDGES = {"1K": 1024, "2K": 2048, "4K": 4096}
+MIME_TYPES = {"png": "image/png", "jpg": "image/jpeg"}
+# Source formats the API takes as-is; these are uploaded byte for byte when they
+# already fit the target resolution.
+PASSTHROUGH_FORMATS = {"PNG": "image/png", "JPEG": "image/jpeg", "WEBP": "image/webp"}
+# Least recently used encoded inputs are evicted above this size.
+INPUT_CACHE_MAX_BYTES = 512 << 20
 
 
 def get_api_key(provided_key: str | None) -> str | None:
@@ -29,101 +58,270 @@ def get_api_key(provided_key: str | None) -> str | None:
     return os.environ.get("GEMINI_API_KEY")
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Generate images using Nano Banana Pro (Gemini 3 Pro Image)"
-    )
-    parser.add_argument(
-        "--prompt", "-p",
-        required=True,
-        help="Image description/prompt"
-    )
-    parser.add_argument(
-        "--filename", "-f",
-        required=True,
-        help="Output filename (e.g., sunset-mountains.png)"
-    )
-    parser.add_argument(
-        "--input-image", "-i",
-        action="append",
-        dest="input_images",
-        metavar="IMAGE",
-        help="Input image path(s) for editing/composition. Can be specified multiple times (up to 14 images)."
-    )
-    parser.add_argument(
-        "--resolution", "-r",
-        choices=["1K", "2K", "4K"],
-        default="1K",
-        help="Output resolution: 1K (default), 2K, or 4K"
-    )
-    parser.add_argument(
-        "--api-key", "-k",
-        help="Gemini API key (overrides GEMINI_API_KEY env var)"
-    )
+def state_dir() -> str:
+    return os.environ.get("OPENCLAW_STATE_DIR") or os.path.join(os.path.expanduser("~"), ".openclaw")
 
-    args = parser.parse_args()
 
-    # Get API key
-    api_key = get_api_key(args.api_key)
-    if not api_key:
-        print("Error: No API key provided.", file=sys.stderr)
-        print("Please either:", file=sys.stderr)
-        print("  1. Provide --api-key argument", file=sys.stderr)
-        print("  2. Set GEMINI_API_KEY environment variable", file=sys.stderr)
-        sys.exit(1)
+def default_socket_path() -> str:
+    return os.path.join(state_dir(), "run", "nano-banana-pro.sock")
 
-    # Import here after checking API key to avoid slow import on error
+
+def input_cache_dir() -> Path:
+    return Path(state_dir()) / "cache" / "nano-banana-pro" / "inputs"
+
+
+def evict_input_cache(cache_dir: Path, max_bytes: int = INPUT_CACHE_MAX_BYTES) -> int:
+    """Delete the least recently used encoded inputs until the cache fits max_bytes; returns how many went."""
+    files = []
+    for pattern in ("*.png", "*.jpg"):
+        for path in cache_dir.glob(pattern):
+            with contextlib.suppress(FileNotFoundError):
+                st = path.stat()
+                files.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in files)
+    removed = 0
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        with contextlib.suppress(FileNotFoundError):
+            path.unlink()
+            removed += 1
+        total -= size
+    return removed
+
+
+def load_sdk():
+    """Import the SDK and Pillow; returns (genai, types, PILImage)."""
     from google import genai
     from google.genai import types
     from PIL import Image as PILImage
 
-    # Initialise client
-    client = genai.Client(api_key=api_key)
+    return genai, types, PILImage
+
+
+def load_jobs(path: str) -> list[dict]:
+    """Read a JSONL jobs file into validated job dicts."""
+    jobs = []
+    seen: dict[str, int] = {}
+    with open(path, encoding="utf-8") as handle:
+        for lineno, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                job = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{lineno}: invalid JSON: {e}") from e
+            if not isinstance(job, dict) or not job.get("prompt") or not job.get("filename"):
+                raise ValueError(f"{path}:{lineno}: each job needs \"prompt\" and \"filename\"")
+            input_images = job.get("input_images") or []
+            if isinstance(input_images, str):
+                input_images = [input_images]
+            resolution = job.get("resolution") or "1K"
+            if resolution not in RESOLUTIONS:
+                raise ValueError(f"{path}:{lineno}: resolution must be one of {', '.join(RESOLUTIONS)}")
+            # Two jobs writing the same file would race and silently keep only one image.
+            target = os.path.abspath(job["filename"])
+            if target in seen:
+                raise ValueError(f"{path}:{lineno}: filename {job['filename']!r} already used on line {seen[target]}")
+            seen[target] = lineno
+            jobs.append(
+                {
+                    "prompt": job["prompt"],
+                    "filename": job["filename"],
+                    "input_images": list(input_images),
+                    "resolution": resolution,
+                }
+            )
+    return jobs
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        while chunk := handle.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def encode_input(src: str, dst: str, max_edge: int) -> None:
+    """Downscale src to fit max_edge and encode it to dst (format from dst's suffix).
+
+    Runs in a worker process or on a job thread; writes through a uniquely named
+    temp file so concurrent encodes never collide and readers never see a
+    partial cache entry.
+    """
+    from PIL import Image
+
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(dst), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle, Image.open(src) as img:
+            img.thumbnail((max_edge, max_edge), Image.LANCZOS)
+            if dst.endswith(".jpg"):
+                if img.mode not in ("RGB", "L"):
+                    img = img.convert("RGB")
+                img.save(handle, "JPEG", quality=95)
+            else:
+                img.save(handle, "PNG")
+        os.replace(tmp, dst)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+
+_encode_pool: ProcessPoolExecutor | None = None
+_encode_pool_lock = threading.Lock()
+
 
+def encode_pool() -> ProcessPoolExecutor:
+    """Process pool shared by every job in this process, created on first use.
+
+    Workers are spawned rather than forked: the parent runs job threads and
+    holds an API client, neither of which is safe to fork.
+    """
+    global _encode_pool
+    with _encode_pool_lock:
+        if _encode_pool is None:
+            _encode_pool = ProcessPoolExecutor(
+                max_workers=min(MAX_INPUT_IMAGES, os.cpu_count() or 1),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _encode_pool
+
+
+def prepare_inputs(
+    types,
+    sources: list[tuple[str, str | None, int, str]],
+    max_edge: int,
+    log: Callable[[str], None] = print,
+) -> list:
+    """Turn (path, PIL format, longest edge, "png"|"jpg") inputs into inline image Parts.
+
+    Sources in a PASSTHROUGH_FORMATS format that already fit max_edge are sent
+    as their original bytes. The rest are downscaled and encoded in a process
+    pool (see encode_pool), cached by content hash and target edge so repeat
+    edits skip the work. Cache hits are touched and new entries trigger
+    evict_input_cache, so the cache stays bounded and least recently used first.
+    """
+    cache_dir = input_cache_dir()
+    entries = []
+    for src, fmt, longest, ext in sources:
+        if fmt in PASSTHROUGH_FORMATS and longest <= max_edge:
+            entries.append((src, Path(src), PASSTHROUGH_FORMATS[fmt]))
+        else:
+            entries.append((src, cache_dir / f"{file_sha256(src)}-{max_edge}.{ext}", MIME_TYPES[ext]))
+    encoded = [(src, dst) for src, dst, _ in entries if dst != Path(src)]
+    misses = []
+    for src, dst in encoded:
+        try:
+            os.utime(dst)
+        except FileNotFoundError:
+            misses.append((str(dst), src))
+    cached = len(encoded) - len(misses)
+    misses = list(dict(misses).items())
+    if misses:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    if len(misses) == 1:
+        encode_input(misses[0][1], misses[0][0], max_edge)
+    elif misses:
+        pool = encode_pool()
+        for future in [pool.submit(encode_input, src, dst, max_edge) for dst, src in misses]:
+            future.result()
+    log(
+        f"Prepared {len(entries)} input image(s): {len(entries) - len(encoded)} as-is, "
+        f"{len(encoded)} at up to {max_edge}px ({cached} cached)"
+    )
+    parts = [types.Part.from_bytes(data=path.read_bytes(), mime_type=mime) for _, path, mime in entries]
+    if misses:
+        evict_input_cache(cache_dir)
+    return parts
+
+
+def png_is_opaque(data: bytes) -> bool:
+    """True for a PNG with no alpha channel and no tRNS chunk, i.e. one that can be saved as-is."""
+    # Signature (8 bytes) plus a complete IHDR chunk (25 bytes) before reading the color type.
+    if len(data) < 33 or not data.startswith(b"\x89PNG\r\n\x1a\n") or data[12:16] != b"IHDR":
+        return False
+    if data[25] in (4, 6):  # grayscale + alpha, RGBA
+        return False
+    pos = 8
+    while pos + 8 <= len(data):
+        length = int.from_bytes(data[pos : pos + 4], "big")
+        kind = data[pos + 4 : pos + 8]
+        if kind == b"tRNS":
+            return False
+        if kind in (b"IDAT", b"IEND"):  # tRNS must precede image data
+            return True
+        pos += length + 12
+    return False
+
+
+def run_job(
+    client,
+    types,
+    PILImage,
+    prompt: str,
+    filename: str,
+    input_image_paths: list[str],
+    resolution: str,
+    log: Callable[[str], None] = print,
+) -> Path:
+    """Generate one image and save it as PNG; returns the resolved output path.
+
+    Progress goes through `log`; raises RuntimeError with a user-facing message
+    on failure.
+    """
     # Set up output path
-    output_path = Path(args.filename)
+    output_path = Path(filename)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Load input images if provided (up to 14 supported by Nano Banana Pro)
+    # Probe input images if provided (up to 14 supported by Nano Banana Pro);
+    # opening only reads headers, pixels are decoded by prepare_inputs.
     input_images = []
-    output_resolution = args.resolution
-    if args.input_images:
-        if len(args.input_images) > 14:
-            print(f"Error: Too many input images ({len(args.input_images)}). Maximum is 14.", file=sys.stderr)
-            sys.exit(1)
+    sources = []
+    output_resolution = resolution
+    if input_image_paths:
+        if len(input_image_paths) > MAX_INPUT_IMAGES:
+            raise RuntimeError(f"Error: Too many input images ({len(input_image_paths)}). Maximum is {MAX_INPUT_IMAGES}.")
 
         max_input_dim = 0
-        for img_path in args.input_images:
+        for img_path in input_image_paths:
             try:
-                img = PILImage.open(img_path)
-                input_images.append(img)
-                print(f"Loaded input image: {img_path}")
+                with PILImage.open(img_path) as img:
+                    width, height = img.size
+                    # Keep PNG (and anything with alpha) lossless; re-encode the rest as JPEG.
+                    lossless = img.format == "PNG" or "A" in img.getbands() or "transparency" in img.info
+                    sources.append((img_path, img.format, max(width, height), "png" if lossless else "jpg"))
+                log(f"Loaded input image: {img_path}")
 
                 # Track largest dimension for auto-resolution
-                width, height = img.size
                 max_input_dim = max(max_input_dim, width, height)
             except Exception as e:
-                print(f"Error loading input image '{img_path}': {e}", file=sys.stderr)
-                sys.exit(1)
+                raise RuntimeError(f"Error loading input image '{img_path}': {e}") from e
 
         # Auto-detect resolution from largest input if not explicitly set
-        if args.resolution == "1K" and max_input_dim > 0:  # Default value
+        if resolution == "1K" and max_input_dim > 0:  # Default value
             if max_input_dim >= 3000:
                 output_resolution = "4K"
             elif max_input_dim >= 1500:
                 output_resolution = "2K"
             else:
                 output_resolution = "1K"
-            print(f"Auto-detected resolution: {output_resolution} (from max input dimension {max_input_dim})")
+            log(f"Auto-detected resolution: {output_resolution} (from max input dimension {max_input_dim})")
+
+        try:
+            input_images = prepare_inputs(types, sources, RESOLUTION_EDGES[output_resolution], log)
+        except Exception as e:
+            raise RuntimeError(f"Error preparing input images: {e}") from e
 
     # Build contents (images first if editing, prompt only if generating)
     if input_images:
-        contents = [*input_images, args.prompt]
+        contents = [*input_images, prompt]
         img_count = len(input_images)
-        print(f"Processing {img_count} image{'s' if img_count > 1 else ''} with resolution {output_resolution}...")
+        log(f"Processing {img_count} image{'s' if img_count > 1 else ''} with resolution {output_resolution}...")
     else:
-        contents = args.prompt
-        print(f"Generating image with resolution {output_resolution}...")
+        contents = prompt
+        log(f"Generating image with resolution {output_resolution}...")
 
     try:
         response = client.models.generate_content(
@@ -141,7 +339,7 @@ def main():
         image_saved = False
         for part in response.parts:
             if part.text is not None:
-                print(f"Model response: {part.text}")
+                log(f"Model response: {part.text}")
             elif part.inline_data is not None:
                 # Convert inline data to PIL Image and save as PNG
                 from io import BytesIO
@@ -153,6 +351,12 @@ def main():
                     import base64
                     image_data = base64.b64decode(image_data)
 
+                # Opaque PNGs are already what we would write; skip the decode/encode.
+                if png_is_opaque(image_data):
+                    output_path.write_bytes(image_data)
+                    image_saved = True
+                    continue
+
                 image = PILImage.open(BytesIO(image_data))
 
                 # Ensure RGB mode for PNG (convert RGBA to RGB with white background if needed)
@@ -165,20 +369,320 @@ def main():
                 else:
                     image.convert('RGB').save(str(output_path), 'PNG')
                 image_saved = True
+    except Exception as e:
+        raise RuntimeError(f"Error generating image: {e}") from e
 
-        if image_saved:
-            full_path = output_path.resolve()
-            print(f"\nImage saved: {full_path}")
-            # OpenClaw parses MEDIA tokens and will attach the file on supported providers.
-            print(f"MEDIA: {full_path}")
-        else:
-            print("Error: No image was generated in the response.", file=sys.stderr)
+    if not image_saved:
+        raise RuntimeError("Error: No image was generated in the response.")
+    return output_path.resolve()
+
+
+def run_jobs(
+    client,
+    types,
+    PILImage,
+    jobs: list[dict],
+    concurrency: int,
+    log: Callable[[str], None] = print,
+    err: Callable[[str], None] = lambda line: print(line, file=sys.stderr),
+) -> int:
+    """Run jobs on one shared client, logging a MEDIA line as each image lands.
+
+    Returns the number of failed jobs. Log lines from job threads are written
+    one at a time, so print's separate newline write cannot splice them.
+    """
+    failed = 0
+    log_lock = threading.Lock()
+
+    def job_log(job: dict, line: str) -> None:
+        with log_lock:
+            log(f"{job['filename']}: {line}")
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = {
+            pool.submit(
+                run_job,
+                client,
+                types,
+                PILImage,
+                job["prompt"],
+                job["filename"],
+                job["input_images"],
+                job["resolution"],
+                lambda line, job=job: job_log(job, line),
+            ): job
+            for job in jobs
+        }
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                full_path = future.result()
+            except Exception as e:  # one bad job (even an OSError) must not stop the batch
+                failed += 1
+                err(f"{job['filename']}: {e}")
+                continue
+            with log_lock:
+                log(f"Image saved: {full_path}")
+                log(f"MEDIA: {full_path}")
+    return failed
+
+
+def execute(client, types, PILImage, request: dict, log: Callable[[str], None], err: Callable[[str], None]) -> int:
+    """Run a request ({"jobs", "concurrency", "single"}) and return the exit code.
+
+    Shared by the in-process path and the warm worker, so both print the same lines.
+    """
+    jobs = request["jobs"]
+    if request.get("single"):
+        job = jobs[0]
+        try:
+            full_path = run_job(
+                client, types, PILImage, job["prompt"], job["filename"], job["input_images"], job["resolution"], log
+            )
+        except Exception as e:
+            err(str(e))
+            return 1
+        log(f"\nImage saved: {full_path}")
+        # OpenClaw parses MEDIA tokens and will attach the file on supported providers.
+        log(f"MEDIA: {full_path}")
+        return 0
+
+    failed = run_jobs(client, types, PILImage, jobs, request.get("concurrency", 4), log, err)
+    if failed:
+        err(f"Error: {failed} of {len(jobs)} job(s) failed.")
+        return 1
+    return 0
+
+
+def forward(path: str, request: dict) -> int | None:
+    """Run a request on a --serve worker, relaying its output as it streams.
+
+    Returns the exit code, or None when no worker answers (nothing was run).
+    """
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        return None
+    try:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(2.0)
+        sock.connect(path)
+        sock.settimeout(None)
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+    except OSError:
+        return None
+    relayed = False
+    with sock, sock.makefile("rb") as stream:
+        for line in stream:
+            msg = json.loads(line)
+            if "code" in msg:
+                return msg["code"]
+            relayed = True
+            if "stdout" in msg:
+                print(msg["stdout"], flush=True)
+            if "stderr" in msg:
+                print(msg["stderr"], file=sys.stderr, flush=True)
+    if not relayed:
+        return None
+    print("Error: generate_image worker disconnected.", file=sys.stderr)
+    return 1
+
+
+def serve(path: str, api_key: str | None) -> int:
+    """Keep the SDK imported and one client per API key warm, answering requests on `path`."""
+    if not hasattr(socket, "AF_UNIX"):
+        print("Error: --serve requires Unix domain sockets.", file=sys.stderr)
+        return 1
+    genai, types, PILImage = load_sdk()
+    clients = {}
+    clients_lock = threading.Lock()
+
+    def client_for(key: str):
+        with clients_lock:
+            if key not in clients:
+                clients[key] = genai.Client(api_key=key)
+            return clients[key]
+
+    if api_key:
+        client_for(api_key)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if os.path.exists(path):
+        if forward(path, {"ping": True}) is not None:
+            print(f"Error: generate_image worker already running on {path}", file=sys.stderr)
+            return 1
+        os.unlink(path)
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            write_lock = threading.Lock()
+
+            def send(msg: dict) -> None:
+                with write_lock:
+                    self.wfile.write(json.dumps(msg).encode("utf-8") + b"\n")
+                    self.wfile.flush()
+
+            try:
+                request = json.loads(self.rfile.readline())
+                if request.get("ping"):
+                    code = 0
+                else:
+                    client = client_for(request["api_key"])
+                    code = execute(
+                        client,
+                        types,
+                        PILImage,
+                        request,
+                        lambda line: send({"stdout": line}),
+                        lambda line: send({"stderr": line}),
+                    )
+            except BrokenPipeError:
+                return
+            except Exception as e:
+                send({"stderr": f"Error: {e}"})
+                code = 1
+            send({"code": code})
+
+    def stop(signum: int, frame) -> None:
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    with socketserver.ThreadingUnixStreamServer(path, Handler) as server:
+        os.chmod(path, 0o600)
+        print(f"generate_image: serving on {path}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(path)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate images using Nano Banana Pro (Gemini 3 Pro Image)"
+    )
+    parser.add_argument(
+        "--prompt", "-p",
+        help="Image description/prompt"
+    )
+    parser.add_argument(
+        "--filename", "-f",
+        help="Output filename (e.g., sunset-mountains.png)"
+    )
+    parser.add_argument(
+        "--input-image", "-i",
+        action="append",
+        dest="input_images",
+        metavar="IMAGE",
+        help="Input image path(s) for editing/composition. Can be specified multiple times (up to 14 images)."
+    )
+    parser.add_argument(
+        "--resolution", "-r",
+        choices=RESOLUTIONS,
+        default="1K",
+        help="Output resolution: 1K (default), 2K, or 4K"
+    )
+    parser.add_argument(
+        "--jobs",
+        metavar="FILE",
+        help="JSONL file of jobs ({\"prompt\", \"filename\", \"input_images\", \"resolution\"} per line) to run with one client"
+    )
+    parser.add_argument(
+        "--concurrency", "-c",
+        type=int,
+        default=4,
+        help="Jobs to run at once with --jobs (default: 4)"
+    )
+    parser.add_argument(
+        "--api-key", "-k",
+        help="Gemini API key (overrides GEMINI_API_KEY env var)"
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run a warm worker on --socket that later invocations forward to"
+    )
+    parser.add_argument(
+        "--socket",
+        default=default_socket_path(),
+        help="Worker socket (default: ~/.openclaw/run/nano-banana-pro.sock)"
+    )
+    parser.add_argument(
+        "--no-worker",
+        action="store_true",
+        help="Always run in-process, even when a worker is listening"
+    )
+
+    args = parser.parse_args()
+    if args.serve:
+        sys.exit(serve(args.socket, get_api_key(args.api_key)))
+    if args.jobs:
+        if args.prompt or args.filename or args.input_images:
+            parser.error("--jobs cannot be combined with --prompt, --filename or --input-image")
+        try:
+            jobs = load_jobs(args.jobs)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
             sys.exit(1)
+    elif not args.prompt or not args.filename:
+        parser.error("--prompt and --filename are required (or use --jobs)")
 
-    except Exception as e:
-        print(f"Error generating image: {e}", file=sys.stderr)
+    # Get API key
+    api_key = get_api_key(args.api_key)
+    if not api_key:
+        print("Error: No API key provided.", file=sys.stderr)
+        print("Please either:", file=sys.stderr)
+        print("  1. Provide --api-key argument", file=sys.stderr)
+        print("  2. Set GEMINI_API_KEY environment variable", file=sys.stderr)
         sys.exit(1)
 
+    if args.jobs:
+        request = {"jobs": jobs, "concurrency": args.concurrency, "single": False}
+    else:
+        job = {
+            "prompt": args.prompt,
+            "filename": args.filename,
+            "input_images": args.input_images or [],
+            "resolution": args.resolution,
+        }
+        request = {"jobs": [job], "single": True}
+
+    # A warm worker skips the SDK import and client setup; it resolves paths
+    # on its side, so hand it absolute ones.
+    if not args.no_worker:
+        remote = {
+            **request,
+            "api_key": api_key,
+            "jobs": [
+                {
+                    **job,
+                    "filename": os.path.abspath(job["filename"]),
+                    "input_images": [os.path.abspath(p) for p in job["input_images"]],
+                }
+                for job in request["jobs"]
+            ],
+        }
+        code = forward(args.socket, remote)
+        if code is not None:
+            sys.exit(code)
+
+    # Import here after checking API key to avoid slow import on error
+    genai, types, PILImage = load_sdk()
+
+    # Initialise client
+    client = genai.Client(api_key=api_key)
+
+    code = execute(
+        client,
+        types,
+        PILImage,
+        request,
+        lambda line: print(line, flush=True),
+        lambda line: print(line, file=sys.stderr),
+    )
+    if code:
+        sys.exit(code)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Benchmark gen.py end to end against the bundled mock Images API.
+
+Starts mock_images_api.py on a free port, then runs gen.py once per
+concurrency level with a fresh output directory and records wall time,
+images/min and the p50/p95/p99 request latency from its timings.jsonl.
+
+Usage:
+    python bench_gen.py --levels 1,2,4,8,16 --count 32 --latency 2 --output bench.json
+    python bench_gen.py --levels 8 --rate-limit-rate 0.2 --error-rate 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime, timezone
+from pathlib import Path
+
+from gen import percentile
+
+SCRIPTS = Path(__file__).resolve().parent
+
+
+def parse_levels(value: str) -> list[int]:
+    try:
+        return [int(part) for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid levels '{value}' (expected e.g. 1,2,4,8)")
+
+
+def mock_stats(base_url: str) -> dict:
+    root = base_url.rsplit("/v1", 1)[0]
+    with urllib.request.urlopen(f"{root}/stats", timeout=10) as resp:
+        return json.load(resp)
+
+
+def run_level(base_url: str, level: int, args: argparse.Namespace, workdir: str) -> dict:
+    out_dir = Path(workdir) / f"c{level}"
+    cmd = [
+        sys.executable,
+        str(SCRIPTS / "gen.py"),
+        "--base-url",
+        base_url,
+        "--count",
+        str(args.count),
+        "--concurrency",
+        str(level),
+        "--writers",
+        str(args.writers),
+        "--thumb-size",
+        "0",
+        "--out-dir",
+        str(out_dir),
+    ]
+    if args.prompt:
+        cmd += ["--prompt", args.prompt]
+    env = {**os.environ, "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY") or "mock"}
+    before = mock_stats(base_url)
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, env=env, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    after = mock_stats(base_url)
+    if proc.returncode != 0:
+        raise RuntimeError(f"gen.py failed at concurrency {level}:\n{proc.stderr[-2000:]}")
+
+    records = [json.loads(line) for line in (out_dir / "timings.jsonl").read_text(encoding="utf-8").splitlines()]
+    latencies = [r["request_s"] for r in records if not r["cached"]]
+    ttfbs = [r["ttfb_s"] for r in records if not r["cached"]]
+    return {
+        "concurrency": level,
+        "images": len(records),
+        "wallSeconds": wall,
+        "imagesPerMinute": len(records) / wall * 60,
+        "requestP50": percentile(latencies, 50),
+        "requestP95": percentile(latencies, 95),
+        "requestP99": percentile(latencies, 99),
+        "ttfbP50": percentile(ttfbs, 50),
+        "bytes": sum(r["bytes"] for r in records),
+        "apiRequests": after["requests"] - before["requests"],
+        "throttled": after["throttled"] - before["throttled"],
+        "errors": after["errors"] - before["errors"],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark gen.py throughput against mock_images_api.py.")
+    parser.add_argument("--levels", type=parse_levels, default=parse_levels("1,2,4,8,16"), help="--concurrency values (default: 1,2,4,8,16).")
+    parser.add_argument("--count", type=int, default=32, help="Images per run (default: 32).")
+    parser.add_argument("--prompt", default="", help="Fixed prompt, so runs use multi-image requests (default: random prompts).")
+    parser.add_argument("--writers", type=int, default=2, help="gen.py --writers (default: 2).")
+    parser.add_argument("--mode", choices=["b64", "url"], default="b64")
+    parser.add_argument("--latency", type=float, default=1.0, help="Mock latency in seconds (default: 1.0).")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Mock latency jitter in seconds (default: 0.2).")
+    parser.add_argument("--payload-bytes", default="2e6", help="Mock PNG size (default: 2e6).")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="openai-image-gen-bench.json", help="JSON results path (default: openai-image-gen-bench.json).")
+    args = parser.parse_args()
+
+    mock = subprocess.Popen(
+        [
+            sys.executable,
+            str(SCRIPTS / "mock_images_api.py"),
+            "--port",
+            "0",
+            "--mode",
+            args.mode,
+            "--latency",
+            str(args.latency),
+            "--jitter",
+            str(args.jitter),
+            "--payload-bytes",
+            args.payload_bytes,
+            "--error-rate",
+            str(args.error_rate),
+            "--rate-limit-rate",
+            str(args.rate_limit_rate),
+            "--retry-after",
+            str(args.retry_after),
+            "--seed",
+            str(args.seed),
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    results = []
+    try:
+        base_url = mock.stdout.readline().strip()
+        if not base_url:
+            raise RuntimeError("mock_images_api.py did not start")
+        with tempfile.TemporaryDirectory(prefix="openai-image-gen-bench-") as workdir:
+            for level in args.levels:
+                result = run_level(base_url, level, args, workdir)
+                results.append(result)
+                print(
+                    f"concurrency {level:>3}  {result['imagesPerMinute']:8.1f} images/min  "
+                    f"p50 {result['requestP50']:.2f}s  p95 {result['requestP95']:.2f}s  "
+                    f"p99 {result['requestP99']:.2f}s  429s {result['throttled']}",
+                    file=sys.stderr,
+                )
+    finally:
+        mock.terminate()
+        mock.wait()
+
+    report = {
+        "generatedAt": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"Wrote: {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,15 +1,38 @@
 #!/usr/bin/env python3
+from __future__ import annotations
+
 import argparse
 import base64
+import binascii
+import contextlib
 import datetime as dt
+import email.utils
+import hashlib
+import http.client
+import importlib.util
 import json
+import math
 import os
+import queue
 import random
 import re
+import shutil
+import ssl
 import sys
-import urllib.error
+import tempfile
+import threading
+import time
+import urllib.parse
 import urllib.request
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import BinaryIO, Callable
+
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+# Statuses worth retrying: throttling and transient server-side failures.
+RETRY_STATUSES = frozenset({408, 409, 429, 500, 502, 503, 504})
+# Raw base64 per image is held in memory up to this size, then spilled to disk.
+SPOOL_MAX_BYTES = 4 << 20
 
 
 def slugify(text: str) -> str:
@@ -27,6 +50,11 @@ def default_out_dir() -> Path:
     return base / f"openai-image-gen-{now}"
 
 
+def default_cache_dir() -> Path:
+    state = os.environ.get("OPENCLAW_STATE_DIR") or Path.home() / ".openclaw"
+    return Path(state) / "cache" / "openai-image-gen"
+
+
 def pick_prompts(count: int) -> list[str]:
     subjects = [
         "a lobster astronaut",
@@ -74,6 +102,301 @@ def get_model_defaults(model: str) -> tuple[str, str]:
         return ("1024x1024", "high")
 
 
+def get_model_max_n(model: str) -> int:
+    """Return how many images one request may ask for (the API's `n`)."""
+    if model == "dall-e-3":
+        return 1
+    # dall-e-2 and GPT image models accept up to 10
+    return 10
+
+
+class HttpSession:
+    """Keep-alive HTTP/1.1 client shared by API calls and image downloads.
+
+    Idle connections are pooled per (scheme, host, port); a request borrows one
+    and returns it once the response body has been read to the end. Like urllib,
+    it honours HTTP_PROXY/HTTPS_PROXY/NO_PROXY: HTTPS goes through a CONNECT
+    tunnel and plain HTTP is sent to the proxy in absolute form.
+    """
+
+    def __init__(self, timeout: float = 300, max_idle: int = 8) -> None:
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self._idle: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._ssl = ssl.create_default_context()
+        self._proxies = urllib.request.getproxies()
+
+    def _proxy(self, scheme: str, host: str) -> urllib.parse.SplitResult | None:
+        proxy = self._proxies.get(scheme)
+        if not proxy or urllib.request.proxy_bypass(host):
+            return None
+        parts = urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+        return parts if parts.hostname else None
+
+    @staticmethod
+    def _proxy_headers(proxy: urllib.parse.SplitResult) -> dict[str, str]:
+        if proxy.username is None:
+            return {}
+        credentials = f"{urllib.parse.unquote(proxy.username)}:{urllib.parse.unquote(proxy.password or '')}"
+        return {"Proxy-Authorization": "Basic " + base64.b64encode(credentials.encode("utf-8")).decode("ascii")}
+
+    def _checkout(
+        self, key: tuple[str, str, int], proxy: urllib.parse.SplitResult | None
+    ) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        scheme, host, port = key
+        if proxy is not None:
+            proxy_port = proxy.port or (443 if proxy.scheme == "https" else 80)
+            if scheme == "https":
+                conn = http.client.HTTPSConnection(proxy.hostname, proxy_port, timeout=self.timeout, context=self._ssl)
+                conn.set_tunnel(host, port, headers=self._proxy_headers(proxy))
+                return conn, False
+            return http.client.HTTPConnection(proxy.hostname, proxy_port, timeout=self.timeout), False
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout, context=self._ssl), False
+        return http.client.HTTPConnection(host, port, timeout=self.timeout), False
+
+    def _release(self, key: tuple[str, str, int], conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+    @contextlib.contextmanager
+    def request(self, method: str, url: str, body: bytes | None = None, headers: dict | None = None):
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        proxy = self._proxy(parts.scheme, parts.hostname)
+        if proxy is not None and parts.scheme == "http":
+            target = urllib.parse.urlunsplit(parts._replace(fragment=""))
+            headers = {**(headers or {}), **self._proxy_headers(proxy)}
+        for attempt in range(2):
+            conn, reused = self._checkout(key, proxy)
+            try:
+                conn.request(method, target, body=body, headers=headers or {})
+                resp = conn.getresponse()
+            except ConnectionError:
+                conn.close()
+                # The server may have dropped an idle keep-alive connection; retry once on a fresh one.
+                if reused and attempt == 0:
+                    continue
+                raise
+            except BaseException:
+                conn.close()
+                raise
+            break
+        try:
+            yield resp
+            # Drain whatever the caller left so the connection can carry the next request.
+            resp.read()
+        except BaseException:
+            conn.close()
+            raise
+        if resp.will_close:
+            conn.close()
+        else:
+            self._release(key, conn)
+
+    def download(self, url: str, path: Path, max_redirects: int = 5) -> None:
+        for _ in range(max_redirects + 1):
+            with self.request("GET", url) as resp:
+                location = resp.getheader("Location")
+                if resp.status in (301, 302, 303, 307, 308) and location:
+                    url = urllib.parse.urljoin(url, location)
+                    continue
+                if resp.status >= 400:
+                    raise RuntimeError(f"HTTP {resp.status} {resp.reason}")
+                # Write beside the target and swap it in: `path` may be a hardlink to a cache entry.
+                partial = path.with_name(f"{path.name}.part")
+                with open(partial, "wb") as f:
+                    shutil.copyfileobj(resp, f, 1 << 16)
+                os.replace(partial, path)
+                return
+        raise RuntimeError("Too many redirects")
+
+
+_STRING_SPECIAL = re.compile(rb'["\\]')
+
+
+class B64JsonScanner:
+    """Incrementally scan an Images API JSON body, writing the unescaped base64
+    text of every "b64_json" value into a file from `open_sink(index)`.
+
+    Sinks are left open for a later `decode_b64_file`. Everything else is
+    copied into a small skeleton document, with each streamed value replaced by
+    `true`, which `finish()` parses with json.loads.
+    """
+
+    def __init__(self, open_sink: Callable[[int], BinaryIO]) -> None:
+        self._open_sink = open_sink
+        self.skeleton = bytearray()
+        self.images = 0
+        self._sink: BinaryIO | None = None
+        self._in_string = False
+        self._escape = False
+        self._token = bytearray()
+        self._last_string: bytes | None = None
+        self._key: bytes | None = None
+
+    def feed(self, chunk: bytes) -> None:
+        i, n = 0, len(chunk)
+        while i < n:
+            if self._escape:
+                # Base64 never needs escaping except an optional "\/".
+                if self._sink is not None:
+                    if chunk[i : i + 1] == b"/":
+                        self._sink.write(b"/")
+                else:
+                    self.skeleton += chunk[i : i + 1]
+                    self._token += chunk[i : i + 1]
+                self._escape = False
+                i += 1
+            elif self._sink is not None or self._in_string:
+                m = _STRING_SPECIAL.search(chunk, i)
+                j = m.start() if m else n
+                if self._sink is not None:
+                    self._sink.write(chunk[i:j])
+                else:
+                    self.skeleton += chunk[i:j]
+                    if len(self._token) < 64:
+                        self._token += chunk[i:j]
+                if m is None:
+                    return
+                if chunk[j] == 0x5C:  # backslash
+                    self._escape = True
+                    if self._sink is None:
+                        self.skeleton += b"\\"
+                        self._token += b"\\"
+                elif self._sink is not None:
+                    self._sink = None
+                else:
+                    self.skeleton += b'"'
+                    self._in_string = False
+                    self._last_string = bytes(self._token) if len(self._token) < 64 else None
+                i = j + 1
+            else:
+                c = chunk[i : i + 1]
+                if c == b'"':
+                    if self._key == b"b64_json":
+                        self._sink = self._open_sink(self.images)
+                        self.images += 1
+                        self.skeleton += b"true"
+                    else:
+                        self._in_string = True
+                        self._token.clear()
+                        self.skeleton += c
+                    self._key = None
+                else:
+                    if c == b":":
+                        self._key = self._last_string
+                    elif c not in b" \t\r\n":
+                        self._key = None
+                        self._last_string = None
+                    self.skeleton += c
+                i += 1
+
+    def finish(self) -> dict:
+        if self._sink is not None or self._in_string or self._escape:
+            raise RuntimeError("Truncated OpenAI Images API response.")
+        return json.loads(self.skeleton.decode("utf-8"))
+
+
+class ApiError(RuntimeError):
+    def __init__(self, status: int, message: str, retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - dt.datetime.now(dt.timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """Exponential backoff with full jitter for the given 0-based retry attempt."""
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+class AdaptiveLimiter:
+    """AIMD cap on in-flight API calls.
+
+    The limit grows by about one slot per limit's worth of successes, is halved
+    on a 429 (at most once per pause) and never leaves [1, max_limit]. A 429
+    also pauses new calls for its Retry-After delay.
+    """
+
+    def __init__(self, max_limit: int) -> None:
+        self.max_limit = max(1, max_limit)
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        self.throttled = 0
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+
+    @contextlib.contextmanager
+    def slot(self):
+        with self._cond:
+            while True:
+                wait = self._paused_until - time.monotonic()
+                if wait <= 0 and self.in_flight < int(self.limit):
+                    break
+                self._cond.wait(wait if wait > 0 else None)
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self.in_flight -= 1
+                self._cond.notify_all()
+
+    def success(self) -> None:
+        with self._cond:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+    def throttle(self, delay: float) -> None:
+        with self._cond:
+            self.throttled += 1
+            now = time.monotonic()
+            if now >= self._paused_until:
+                self.limit = max(1.0, self.limit / 2)
+            self._paused_until = max(self._paused_until, now + delay)
+            self._cond.notify_all()
+
+
+def decode_b64_file(src: BinaryIO, dst: BinaryIO, chunk_size: int = 1 << 16) -> None:
+    """Decode base64 text from src into dst; chunk_size must be a multiple of 4."""
+    while chunk := src.read(chunk_size):
+        dst.write(binascii.a2b_base64(chunk + b"=" * (-len(chunk) % 4)))
+
+
 def request_images(
     api_key: str,
     prompt: str,
@@ -83,13 +406,22 @@ def request_images(
     background: str = "",
     output_format: str = "",
     style: str = "",
+    session: HttpSession | None = None,
+    base_url: str = DEFAULT_BASE_URL,
+    open_sink: Callable[[int], BinaryIO] | None = None,
+    n: int = 1,
+    stats: dict | None = None,
 ) -> dict:
-    url = "https://api.openai.com/v1/images/generations"
+    """POST an Images API request. With `open_sink`, the base64 text of b64_json
+    images is streamed into those files as the body arrives (see
+    decode_b64_file) and comes back as `true` in the result. `stats`, if given, receives the time
+    to first byte and the response size."""
+    url = f"{base_url.rstrip('/')}/images/generations"
     args = {
         "model": model,
         "prompt": prompt,
         "size": size,
-        "n": 1,
+        "n": n,
     }
 
     # Quality parameter - dall-e-2 doesn't accept this parameter
@@ -109,35 +441,462 @@ def request_images(
         args["style"] = style
 
     body = json.dumps(args).encode("utf-8")
-    req = urllib.request.Request(
-        url,
-        method="POST",
-        headers={
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        },
-        data=body,
-    )
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+    }
+    stats = {} if stats is None else stats
+    start = time.perf_counter()
+    with (session or HttpSession()).request("POST", url, body=body, headers=headers) as resp:
+        stats["ttfb_s"] = time.perf_counter() - start
+        if resp.status >= 400 or open_sink is None:
+            payload = resp.read()
+            stats["bytes"] = len(payload)
+            if resp.status >= 400:
+                raise ApiError(
+                    resp.status,
+                    f"OpenAI Images API failed ({resp.status}): {payload.decode('utf-8', errors='replace')}",
+                    parse_retry_after(resp.getheader("Retry-After")),
+                )
+            return json.loads(payload.decode("utf-8"))
+        scanner = B64JsonScanner(open_sink)
+        stats["bytes"] = 0
+        while chunk := resp.read(1 << 16):
+            stats["bytes"] += len(chunk)
+            scanner.feed(chunk)
+        return scanner.finish()
+
+
+def place_file(src: Path, dst: Path) -> None:
+    """Hardlink src to dst (replacing dst), copying when linking is not possible."""
+    tmp = dst.with_name(f"{dst.name}.{threading.get_ident()}.tmp")
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+class ImageCache:
+    """Content-addressed store of generated images with an LRU size cap.
+
+    Entries live at `<root>/<key[:2]>/<key>.<ext>`; a hit bumps the file's
+    mtime, and `evict()` drops the least recently used files over the cap.
+    """
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(variant: int, seed: str, **params: str) -> str:
+        blob = json.dumps({"variant": variant, "seed": seed, **params}, sort_keys=True)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str, ext: str) -> Path:
+        return self.root / key[:2] / f"{key}.{ext}"
+
+    def fetch(self, key: str, ext: str, dst: Path) -> bool:
+        path = self._path(key, ext)
+        try:
+            os.utime(path)
+            place_file(path, dst)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return False
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def store(self, key: str, ext: str, src: Path) -> None:
+        path = self._path(key, ext)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        place_file(src, path)
+
+    def evict(self) -> int:
+        files = []
+        for path in self.root.glob("*/*"):
+            with contextlib.suppress(FileNotFoundError):
+                st = path.stat()
+                files.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
+                removed += 1
+            total -= size
+        return removed
+
+
+class Journal:
+    """Append-only JSONL log of a run: one plan line, then one line per finished image.
+
+    Lines are flushed as they are written, so a crashed run can be resumed and
+    its gallery rebuilt from whatever made it to disk.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._handle = None
+
+    def read(self) -> tuple[dict | None, dict[int, dict]]:
+        plan, done = None, {}
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return None, {}
+        for line in lines:
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn final line from a crash
+            if "plan" in rec:
+                plan = rec["plan"]
+            elif "idx" in rec:
+                done[rec["idx"]] = {"prompt": rec["prompt"], "file": rec["file"]}
+        return plan, done
+
+    def open(self, plan: dict | None = None) -> None:
+        self._handle = self.path.open("w" if plan else "a", encoding="utf-8")
+        if plan:
+            self._append({"plan": plan})
+
+    def _append(self, rec: dict) -> None:
+        with self._lock:
+            self._handle.write(json.dumps(rec) + "\n")
+            self._handle.flush()
+
+    def record(self, idx: int, item: dict) -> None:
+        self._append({"idx": idx, **item})
+
+    def close(self) -> None:
+        if self._handle:
+            self._handle.close()
+            self._handle = None
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class Timings:
+    """Per-image timing records, appended to timings.jsonl as images are written.
+
+    Fields: queue_wait_s (submission until the first API attempt starts),
+    ttfb_s, request_s (first attempt start until the image is received,
+    retries included), handoff_s (time in the decode queue), write_s (decode
+    and write), bytes (received for the image), response_bytes, attempts.
+    """
+
+    def __init__(self, path: Path, append: bool = False) -> None:
+        self.records: list[dict] = []
+        self._lock = threading.Lock()
+        self._handle = path.open("a" if append else "w", encoding="utf-8")
+
+    def record(self, rec: dict) -> None:
+        with self._lock:
+            self.records.append(rec)
+            self._handle.write(json.dumps(rec) + "\n")
+            self._handle.flush()
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def summary(self, wall_s: float) -> str:
+        fresh = [r for r in self.records if not r["cached"]]
+        lines = [f"{len(self.records)} image(s) in {wall_s:.1f}s ({len(self.records) / wall_s * 60:.1f} images/min)"]
+        for field in ("ttfb_s", "request_s", "write_s"):
+            values = [r[field] for r in fresh if r.get(field) is not None]
+            if values:
+                p50, p95, p99 = (percentile(values, pct) for pct in (50, 95, 99))
+                lines.append(f"{field[:-2]:>8}: p50 {p50:.2f}s  p95 {p95:.2f}s  p99 {p99:.2f}s")
+        if fresh:
+            lines.append(f"   bytes: {sum(r['bytes'] for r in fresh) / 1e6:.1f} MB received")
+        return "\n".join(lines)
+
+
+def fetch_batch(
+    session: HttpSession,
+    base_url: str,
+    api_key: str,
+    args: argparse.Namespace,
+    size: str,
+    quality: str,
+    out_dir: Path,
+    file_ext: str,
+    total: int,
+    prompt: str,
+    jobs: list[tuple[int, str]],
+    cache: ImageCache | None,
+    decoded: queue.Queue,
+    failed: list[BaseException],
+    limiter: AdaptiveLimiter | None = None,
+    submitted: float | None = None,
+) -> None:
+    """Network stage: generate one image per (idx, cache_key) job for a single
+    prompt, asking for all cache misses in one request with `n` set to their count.
+
+    b64_json images are spooled as base64 text and handed to the disk stage
+    through `decoded`, whose bound stalls this worker while the disk falls
+    behind; URL results are streamed straight to their files. Throttled and
+    transient failures are retried up to args.retries times, pacing through
+    `limiter`; a response with fewer images than asked for uses up a retry to
+    request the rest. Each ready image carries a timing record (see Timings).
+    """
+    if failed:
+        return
+    submitted = time.perf_counter() if submitted is None else submitted
+    ready: list[tuple[int, str, Path, BinaryIO | None, dict]] = []
+    pending: list[tuple[int, str, Path]] = []
+    for idx, cache_key in jobs:
+        filepath = out_dir / f"{idx:03d}-{slugify(prompt)[:40]}.{file_ext}"
+        if cache and cache.fetch(cache_key, file_ext, filepath):
+            print(f"[{idx}/{total}] (cached) {prompt}")
+            timing = {"idx": idx, "cached": True, "queue_wait_s": time.perf_counter() - submitted}
+            ready.append((idx, "", filepath, None, timing))  # no key: nothing to store
+        else:
+            print(f"[{idx}/{total}] {prompt}")
+            pending.append((idx, cache_key, filepath))
+
+    spools: list[BinaryIO] = []
+
+    def open_sink(index: int) -> BinaryIO:
+        if index >= len(pending):
+            raise RuntimeError("Unexpected extra image in response.")
+        spools.append(tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES))
+        return spools[-1]
+
+    limiter = limiter or AdaptiveLimiter(1)
+    stats: dict = {}
+    first_attempt = None
     try:
-        with urllib.request.urlopen(req, timeout=300) as resp:
-            return json.loads(resp.read().decode("utf-8"))
-    except urllib.error.HTTPError as e:
-        payload = e.read().decode("utf-8", errors="replace")
-        raise RuntimeError(f"OpenAI Images API failed ({e.code}): {payload}") from e
+        attempt = 0
+        while pending:
+            # Spools before `fresh` belong to images already in `ready`.
+            fresh = len(spools)
+            try:
+                with limiter.slot():
+                    if first_attempt is None:
+                        first_attempt = time.perf_counter()
+                    res = request_images(
+                        api_key,
+                        prompt,
+                        args.model,
+                        size,
+                        quality,
+                        args.background,
+                        args.output_format,
+                        args.style,
+                        session=session,
+                        base_url=base_url,
+                        open_sink=open_sink,
+                        n=len(pending),
+                        stats=stats,
+                    )
+                limiter.success()
+            except (ApiError, OSError, http.client.HTTPException) as e:
+                status = getattr(e, "status", None)
+                if attempt >= args.retries or failed or (status is not None and status not in RETRY_STATUSES):
+                    raise
+                delay = getattr(e, "retry_after", None)
+                if delay is None:
+                    delay = backoff_delay(attempt)
+                if status == 429:
+                    limiter.throttle(delay)
+                attempt += 1
+                print(f"Retrying {prompt!r} in {delay:.1f}s ({attempt}/{args.retries}): {str(e)[:200]}", file=sys.stderr)
+                for spool in spools[fresh:]:
+                    spool.close()
+                del spools[fresh:]
+                time.sleep(delay)
+                continue
+            results = res.get("data") or []
+            if not results:
+                raise RuntimeError(f"Unexpected response: {json.dumps(res)[:400]}")
+            spooled = iter(spools[fresh:])
+            for data, (idx, cache_key, filepath) in zip(results, pending):
+                timing = {
+                    "idx": idx,
+                    "cached": False,
+                    "queue_wait_s": first_attempt - submitted,
+                    "ttfb_s": stats["ttfb_s"],
+                    "attempts": attempt + 1,
+                    "response_bytes": stats["bytes"],
+                }
+                if data.get("b64_json") is True:
+                    spool = next(spooled)
+                    timing["bytes"] = spool.tell()
+                    timing["request_s"] = time.perf_counter() - first_attempt
+                    ready.append((idx, cache_key, filepath, spool, timing))
+                elif data.get("url"):
+                    image_url = data["url"]
+                    try:
+                        session.download(image_url, filepath)
+                    except (OSError, http.client.HTTPException, RuntimeError) as e:
+                        raise RuntimeError(f"Failed to download image from {image_url}: {e}") from e
+                    timing["bytes"] = filepath.stat().st_size
+                    timing["request_s"] = time.perf_counter() - first_attempt
+                    ready.append((idx, cache_key, filepath, None, timing))
+                else:
+                    raise RuntimeError(f"Unexpected response: {json.dumps(res)[:400]}")
+            if len(results) < len(pending):
+                # A short response is treated like a transient failure: ask again for the rest.
+                message = f"asked for {len(pending)} image(s) of {prompt!r}, got {len(results)}"
+                if attempt >= args.retries or failed:
+                    raise RuntimeError(f"Short response: {message}.")
+                attempt += 1
+                print(f"Requesting the rest: {message} ({attempt}/{args.retries}).", file=sys.stderr)
+            pending = pending[len(results):]
+    except BaseException:
+        for spool in spools:
+            spool.close()
+        raise
+    decoded.put((prompt, ready, time.perf_counter()))
+
 
+def write_batch(
+    prompt: str,
+    ready: list[tuple[int, str, Path, BinaryIO | None, dict]],
+    queued: float,
+    journal: Journal,
+    timings: Timings | None,
+    cache: ImageCache | None,
+    file_ext: str,
+) -> None:
+    handoff = time.perf_counter() - queued
+    for idx, cache_key, filepath, spool, timing in ready:
+        start = time.perf_counter()
+        if spool is not None:
+            partial = filepath.with_name(f"{filepath.name}.part")
+            with spool, open(partial, "wb") as f:
+                spool.seek(0)
+                decode_b64_file(spool, f)
+            os.replace(partial, filepath)
+        if cache and cache_key:
+            cache.store(cache_key, file_ext, filepath)
+        journal.record(idx, {"prompt": prompt, "file": filepath.name})
+        if timings:
+            timings.record({**timing, "handoff_s": handoff, "write_s": time.perf_counter() - start})
+
+
+def write_batches(
+    decoded: queue.Queue,
+    journal: Journal,
+    timings: Timings | None,
+    cache: ImageCache | None,
+    file_ext: str,
+    failed: list[BaseException],
+) -> None:
+    """Disk stage: decode and write queued batches until a None sentinel.
+
+    After the first failure the remaining batches are only drained, so network
+    workers never block on a full queue; main() re-raises `failed[0]`.
+    """
+    while (batch := decoded.get()) is not None:
+        prompt, ready, queued = batch
+        if not failed:
+            try:
+                write_batch(prompt, ready, queued, journal, timings, cache, file_ext)
+                continue
+            except BaseException as e:
+                failed.append(e)
+        for *_, spool, _ in ready:
+            if spool is not None:
+                spool.close()
+
+
+def make_thumbnail(src: str, dst: str, max_px: int) -> None:
+    from PIL import Image
+
+    with Image.open(src) as im:
+        im.thumbnail((max_px, max_px))
+        if im.mode not in ("RGB", "RGBA"):
+            im = im.convert("RGBA")
+        im.save(dst, "WEBP", quality=80)
+
+
+def write_thumbnails(out_dir: Path, items: list[dict], max_px: int) -> dict[str, str]:
+    """Create WebP thumbnails under out_dir/thumbs in a process pool.
+
+    Returns {image file: thumbnail path}; up-to-date thumbnails are reused and
+    an empty mapping (full-size images in the gallery) means Pillow is missing.
+    """
+    if importlib.util.find_spec("PIL") is None:
+        print("Pillow not installed; the gallery will load full-size images.", file=sys.stderr)
+        return {}
+    thumb_dir = out_dir / "thumbs"
+    thumb_dir.mkdir(exist_ok=True)
+    thumbs: dict[str, str] = {}
+    todo: list[tuple[str, Path, Path]] = []
+    for it in items:
+        src = out_dir / it["file"]
+        dst = thumb_dir / f"{src.stem}.webp"
+        if not src.is_file():
+            continue
+        if dst.is_file() and dst.stat().st_mtime >= src.stat().st_mtime:
+            thumbs[it["file"]] = f"thumbs/{dst.name}"
+        else:
+            todo.append((it["file"], src, dst))
+    if not todo:
+        return thumbs
+    with ProcessPoolExecutor(max_workers=min(len(todo), os.cpu_count() or 1)) as pool:
+        futures = {pool.submit(make_thumbnail, str(src), str(dst), max_px): (name, dst) for name, src, dst in todo}
+        for future in as_completed(futures):
+            name, dst = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                print(f"Warning: thumbnail for {name} failed: {e}", file=sys.stderr)
+                continue
+            thumbs[name] = f"thumbs/{dst.name}"
+    return thumbs
+
+
+def gallery_page_name(page: int) -> str:
+    return "index.html" if page == 1 else f"index-{page}.html"
 
-def write_gallery(out_dir: Path, items: list[dict]) -> None:
-    thumbs = "\n".join(
+
+def write_gallery(out_dir: Path, items: list[dict], thumbs: dict[str, str] | None = None, page_size: int = 100) -> None:
+    thumbs = thumbs or {}
+    page_size = max(1, page_size)
+    pages = max(1, -(-len(items) // page_size))
+    for stale in out_dir.glob("index-*.html"):
+        with contextlib.suppress(ValueError):
+            if int(stale.stem.split("-", 1)[1]) > pages:
+                stale.unlink()
+    for page in range(1, pages + 1):
+        write_gallery_page(out_dir, items[(page - 1) * page_size : page * page_size], thumbs, page, pages)
+
+
+def write_gallery_page(out_dir: Path, items: list[dict], thumbs: dict[str, str], page: int, pages: int) -> None:
+    figures = "\n".join(
         [
             f"""
 <figure>
-  <a href="{it["file"]}"><img src="{it["file"]}" loading="lazy" /></a>
+  <a href="{it["file"]}"><img src="{thumbs.get(it["file"], it["file"])}" loading="lazy" /></a>
   <figcaption>{it["prompt"]}</figcaption>
 </figure>
 """.strip()
             for it in items
         ]
     )
+    nav = ""
+    if pages > 1:
+        links = [
+            f'<a href="{gallery_page_name(p)}">{p}</a>' if p != page else f"<strong>{p}</strong>"
+            for p in range(1, pages + 1)
+        ]
+        nav = f'<nav>Page {" ".join(links)}</nav>'
     html = f"""<!doctype html>
 <meta charset="utf-8" />
 <title>openai-image-gen</title>
@@ -145,6 +904,8 @@ def write_gallery(out_dir: Path, items: list[dict]) -> None:
   :root {{ color-scheme: dark; }}
   body {{ margin: 24px; font: 14px/1.4 ui-sans-serif, system-ui; background: #0b0f14; color: #e8edf2; }}
   h1 {{ font-size: 18px; margin: 0 0 16px; }}
+  nav {{ margin: 16px 0; color: #b7c2cc; }}
+  nav a {{ color: #9cd1ff; }}
   .grid {{ display: grid; grid-template-columns: repeat(auto-fill, minmax(240px, 1fr)); gap: 16px; }}
   figure {{ margin: 0; padding: 12px; border: 1px solid #1e2a36; border-radius: 14px; background: #0f1620; }}
   img {{ width: 100%; height: auto; border-radius: 10px; display: block; }}
@@ -153,11 +914,13 @@ def write_gallery(out_dir: Path, items: list[dict]) -> None:
 </style>
 <h1>openai-image-gen</h1>
 <p>Output: <code>{out_dir.as_posix()}</code></p>
+{nav}
 <div class="grid">
-{thumbs}
+{figures}
 </div>
+{nav}
 """
-    (out_dir / "index.html").write_text(html, encoding="utf-8")
+    (out_dir / gallery_page_name(page)).write_text(html, encoding="utf-8")
 
 
 def main() -> int:
@@ -171,6 +934,27 @@ def main() -> int:
     ap.add_argument("--output-format", default="", help="Output format (GPT models only): png, jpeg, or webp.")
     ap.add_argument("--style", default="", help="Image style (dall-e-3 only): vivid or natural.")
     ap.add_argument("--out-dir", default="", help="Output directory (default: ./tmp/openai-image-gen-<ts>).")
+    ap.add_argument("--base-url", default="", help="API base URL (default: $OPENAI_BASE_URL or https://api.openai.com/v1).")
+    ap.add_argument("--concurrency", type=int, default=1, help="How many requests to keep in flight (default: 1).")
+    ap.add_argument("--retries", type=int, default=5, help="Retries per request on 429/5xx and connection errors (default: 5).")
+    ap.add_argument("--writers", type=int, default=2, help="Threads decoding and writing images while requests continue (default: 2).")
+    ap.add_argument(
+        "--cache",
+        nargs="?",
+        const=str(default_cache_dir()),
+        default="",
+        metavar="DIR",
+        help="Reuse earlier results with identical settings from an on-disk cache (default: ~/.openclaw/cache/openai-image-gen).",
+    )
+    ap.add_argument("--cache-max-mb", type=int, default=2048, help="Evict least recently used cache entries above this size (default: 2048).")
+    ap.add_argument(
+        "--variant-seed",
+        default="",
+        help="Mixed into cache keys; pass a new value to get fresh variants of an otherwise cached run.",
+    )
+    ap.add_argument("--thumb-size", type=int, default=384, help="Longest edge of gallery thumbnails in px; 0 links full-size images (default: 384).")
+    ap.add_argument("--page-size", type=int, default=100, help="Images per gallery page (default: 100).")
+    ap.add_argument("--resume", action="store_true", help="Continue an interrupted run in --out-dir, generating only missing images.")
     args = ap.parse_args()
 
     api_key = (os.environ.get("OPENAI_API_KEY") or "").strip()
@@ -188,10 +972,28 @@ def main() -> int:
         print(f"Warning: dall-e-3 only supports generating 1 image at a time. Reducing count from {count} to 1.", file=sys.stderr)
         count = 1
 
+    if args.resume and not args.out_dir:
+        print("--resume requires --out-dir", file=sys.stderr)
+        return 2
     out_dir = Path(args.out_dir).expanduser() if args.out_dir else default_out_dir()
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    prompts = [args.prompt] * count if args.prompt else pick_prompts(count)
+    journal = Journal(out_dir / "journal.jsonl")
+    plan, done = journal.read() if args.resume else (None, {})
+    if plan:
+        # Resume the recorded prompts so random picks stay stable across runs.
+        prompts = plan["prompts"]
+        if plan.get("model") != args.model:
+            print(f"Warning: resuming a {plan.get('model')} run with --model {args.model}.", file=sys.stderr)
+        done = {idx: it for idx, it in done.items() if (out_dir / it["file"]).is_file()}
+        print(f"Resuming: {len(done)}/{len(prompts)} image(s) already done.", file=sys.stderr)
+        journal.open()
+    else:
+        if args.resume:
+            print(f"Nothing to resume in {out_dir.as_posix()}; starting a new run.", file=sys.stderr)
+        prompts = [args.prompt] * count if args.prompt else pick_prompts(count)
+        done = {}
+        journal.open({"prompts": prompts, "model": args.model})
 
     # Determine file extension based on output format
     if args.model.startswith("gpt-image") and args.output_format:
@@ -199,39 +1001,117 @@ def main() -> int:
     else:
         file_ext = "png"
 
-    items: list[dict] = []
-    for idx, prompt in enumerate(prompts, start=1):
-        print(f"[{idx}/{len(prompts)}] {prompt}")
-        res = request_images(
-            api_key,
-            prompt,
-            args.model,
-            size,
-            quality,
-            args.background,
-            args.output_format,
-            args.style,
+    # One pooled session serves generation calls and URL downloads; point
+    # --base-url at mock_images_api.py to run without api.openai.com.
+    base_url = args.base_url or os.environ.get("OPENAI_BASE_URL") or DEFAULT_BASE_URL
+    concurrency = max(1, args.concurrency)
+    session = HttpSession(max_idle=concurrency)
+    # --concurrency is the ceiling; 429s shrink the in-flight limit, successes grow it back.
+    limiter = AdaptiveLimiter(concurrency)
+
+    # The nth repeat of identical settings is cached as variant n, so a rerun
+    # reproduces a whole batch of duplicates instead of one image n times.
+    cache = ImageCache(Path(args.cache).expanduser(), args.cache_max_mb << 20) if args.cache else None
+    cache_keys: list[str] = []
+    seen: dict[str, int] = {}
+    for prompt in prompts:
+        seen[prompt] = seen.get(prompt, 0) + 1
+        cache_keys.append(
+            ImageCache.key(
+                seen[prompt],
+                args.variant_seed,
+                model=args.model,
+                prompt=prompt,
+                size=size,
+                quality=quality,
+                background=args.background,
+                output_format=args.output_format,
+                style=args.style,
+            )
+            if cache
+            else ""
         )
-        data = res.get("data", [{}])[0]
-        image_b64 = data.get("b64_json")
-        image_url = data.get("url")
-        if not image_b64 and not image_url:
-            raise RuntimeError(f"Unexpected response: {json.dumps(res)[:400]}")
-
-        filename = f"{idx:03d}-{slugify(prompt)[:40]}.{file_ext}"
-        filepath = out_dir / filename
-        if image_b64:
-            filepath.write_bytes(base64.b64decode(image_b64))
+
+    # Runs of the same prompt share one request, up to the model's n limit, but
+    # no larger than an even split of the work over --concurrency, so packing
+    # never leaves request slots idle.
+    todo = len(prompts) - len(done)
+    max_n = max(1, min(get_model_max_n(args.model), math.ceil(todo / concurrency)))
+    batches: list[tuple[str, list[tuple[int, str]]]] = []
+    for idx, prompt in enumerate(prompts, start=1):
+        if idx in done:
+            continue
+        if batches and batches[-1][0] == prompt and len(batches[-1][1]) < max_n:
+            batches[-1][1].append((idx, cache_keys[idx - 1]))
         else:
-            try:
-                urllib.request.urlretrieve(image_url, filepath)
-            except urllib.error.URLError as e:
-                raise RuntimeError(f"Failed to download image from {image_url}: {e}") from e
+            batches.append((prompt, [(idx, cache_keys[idx - 1])]))
 
-        items.append({"prompt": prompt, "file": filename})
+    # Network workers hand spooled payloads to the disk writers through a
+    # bounded queue, so decoding and writing overlap with the next requests
+    # without letting finished payloads pile up. Every written image is
+    # journaled; prompts.json and the gallery are rebuilt from the journal,
+    # even when the run fails part-way.
+    timings = Timings(out_dir / "timings.jsonl", append=bool(plan))
+    writers = max(1, args.writers)
+    decoded: queue.Queue = queue.Queue(maxsize=2 * concurrency)
+    failed: list[BaseException] = []
+    submitted = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=writers) as disk:
+            for _ in range(writers):
+                disk.submit(write_batches, decoded, journal, timings, cache, file_ext, failed)
+            try:
+                with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                    futures = [
+                        pool.submit(
+                            fetch_batch,
+                            session,
+                            base_url,
+                            api_key,
+                            args,
+                            size,
+                            quality,
+                            out_dir,
+                            file_ext,
+                            len(prompts),
+                            prompt,
+                            jobs,
+                            cache,
+                            decoded,
+                            failed,
+                            limiter,
+                            submitted,
+                        )
+                        for prompt, jobs in batches
+                    ]
+                    try:
+                        for future in as_completed(futures):
+                            future.result()
+                    except BaseException:
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        raise
+            finally:
+                for _ in range(writers):
+                    decoded.put(None)
+        if failed:
+            raise failed[0]
+    finally:
+        session.close()
+        timings.close()
+        if timings.records:
+            print(timings.summary(time.perf_counter() - submitted), file=sys.stderr)
+        if limiter.throttled:
+            print(f"Throttled {limiter.throttled} time(s); final concurrency {int(limiter.limit)}.", file=sys.stderr)
+        journal.close()
+        if cache:
+            cache.evict()
+            print(f"Cache: {cache.hits} hit(s), {cache.misses} miss(es)", file=sys.stderr)
+        _, done = journal.read()
+        items = [done[idx] for idx in sorted(done)]
+        (out_dir / "prompts.json").write_text(json.dumps(items, indent=2), encoding="utf-8")
+        thumbs = write_thumbnails(out_dir, items, args.thumb_size) if args.thumb_size > 0 and items else {}
+        write_gallery(out_dir, items, thumbs, args.page_size)
 
-    (out_dir / "prompts.json").write_text(json.dumps(items, indent=2), encoding="utf-8")
-    write_gallery(out_dir, items)
     print(f"\nWrote: {(out_dir / 'index.html').as_posix()}")
     return 0
 
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenAI Images API, for offline gen.py runs and benchmarks.
+
+Serves POST /v1/images/generations with correctly shaped `b64_json` or `url`
+responses (one entry per requested `n`), after a configurable latency, and can
+inject 429s (with Retry-After) and 5xx errors at given rates. URL results are
+served from GET /v1/images/files/<name>.png. Images are valid PNGs padded with a
+private ancillary chunk to the requested payload size.
+
+Usage:
+    python mock_images_api.py --port 8765 --latency 2 --payload-bytes 2e6
+    python gen.py --base-url http://127.0.0.1:8765/v1 --count 16 --concurrency 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import os
+import random
+import signal
+import struct
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def make_png(payload_bytes: int) -> bytes:
+    """A 1x1 RGBA PNG padded to about `payload_bytes` with an incompressible private chunk."""
+    head = b"\x89PNG\r\n\x1a\n" + png_chunk(b"IHDR", struct.pack(">IIBBBBB", 1, 1, 8, 6, 0, 0, 0))
+    tail = png_chunk(b"IDAT", zlib.compress(b"\x00\x80\x80\x80\xff")) + png_chunk(b"IEND", b"")
+    pad = max(0, payload_bytes - len(head) - len(tail) - 12)
+    return head + png_chunk(b"prVt", os.urandom(pad)) + tail
+
+
+class MockImagesServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], args: argparse.Namespace) -> None:
+        super().__init__(address, MockImagesHandler)
+        self.args = args
+        self.image = make_png(args.payload_bytes)
+        self.image_b64 = base64.b64encode(self.image).decode("ascii")
+        self.rng = random.Random(args.seed)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "images": 0, "throttled": 0, "errors": 0}
+
+    def roll(self, rate: float) -> bool:
+        with self.lock:
+            return self.rng.random() < rate
+
+    def count(self, key: str, amount: int = 1) -> None:
+        with self.lock:
+            self.stats[key] += amount
+
+
+class MockImagesHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: MockImagesServer
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.args.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, status: int, payload: dict, headers: dict | None = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path == "/stats":
+            with self.server.lock:
+                self.send_json(200, dict(self.server.stats))
+            return
+        if not self.path.startswith("/v1/images/files/"):
+            self.send_json(404, {"error": {"message": f"No route for GET {self.path}"}})
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(self.server.image)))
+        self.end_headers()
+        self.wfile.write(self.server.image)
+
+    def do_POST(self) -> None:
+        args = self.server.args
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.path != "/v1/images/generations":
+            self.send_json(404, {"error": {"message": f"No route for POST {self.path}"}})
+            return
+        try:
+            req = json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            self.send_json(400, {"error": {"message": "Invalid JSON body"}})
+            return
+        self.server.count("requests")
+        if self.server.roll(args.rate_limit_rate):
+            self.server.count("throttled")
+            headers = {"Retry-After": f"{args.retry_after:g}"}
+            self.send_json(429, {"error": {"message": "Rate limit reached", "type": "requests"}}, headers)
+            return
+        time.sleep(max(0.0, args.latency + random.uniform(-args.jitter, args.jitter)))
+        if self.server.roll(args.error_rate):
+            self.server.count("errors")
+            self.send_json(500, {"error": {"message": "The server had an error processing your request."}})
+            return
+
+        n = max(1, int(req.get("n") or 1))
+        self.server.count("images", n)
+        if args.mode == "url":
+            host = self.headers.get("Host") or f"127.0.0.1:{self.server.server_address[1]}"
+            data = [{"url": f"http://{host}/v1/images/files/{int(time.time() * 1e6)}-{i}.png"} for i in range(n)]
+        else:
+            data = [{"b64_json": self.server.image_b64, "revised_prompt": req.get("prompt", "")} for _ in range(n)]
+        self.send_json(200, {"created": int(time.time()), "data": data})
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Serve a local mock of the OpenAI Images API.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765, help="Port to listen on; 0 picks a free one (default: 8765).")
+    ap.add_argument("--mode", choices=["b64", "url"], default="b64", help="Return b64_json or url results (default: b64).")
+    ap.add_argument("--latency", type=float, default=1.0, help="Seconds before each successful response (default: 1.0).")
+    ap.add_argument("--jitter", type=float, default=0.0, help="Uniform +/- jitter added to --latency (default: 0).")
+    ap.add_argument("--payload-bytes", type=lambda v: int(float(v)), default=2_000_000, help="Size of each PNG (default: 2e6).")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 500 (default: 0).")
+    ap.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with 429 (default: 0).")
+    ap.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s (default: 1).")
+    ap.add_argument("--seed", type=int, default=None, help="Seed for error/429 injection.")
+    ap.add_argument("--verbose", action="store_true", help="Log every request.")
+    args = ap.parse_args()
+
+    def stop(signum: int, frame) -> None:
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    server = MockImagesServer((args.host, args.port), args)
+    host, port = server.server_address[:2]
+    # First stdout line is the base URL, so wrappers can start us with --port 0.
+    print(f"http://{host}:{port}/v1", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.stats), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())